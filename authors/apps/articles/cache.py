@@ -0,0 +1,123 @@
+"""
+Caching of the article detail responses.
+
+Every article slug has a version number in the cache and the serialized
+article is stored under a key holding that version. Writes to an article
+bump its version, so responses cached before the write can no longer be
+found and simply expire after `ARTICLE_CACHE_TTL` seconds.
+
+The article lists share one collection version, bumped along with the
+version of any article, which the list validators are derived from.
+
+All of it is turned off unless the cache is shared by every process serving
+the API, see `ARTICLE_CACHE_ENABLED` in the settings.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Version of the article lists, the time in microseconds of the last write
+COLLECTION_VERSION_KEY = 'articles:version'
+
+
+def is_enabled():
+    """
+    :return: whether the article responses are cached and the lists have
+    validators
+    :rtype: bool
+    """
+    return settings.ARTICLE_CACHE_ENABLED
+
+
+def _slug_key(slug):
+    # slugs come from the URL and the importer, they may hold characters or
+    # be longer than memcached accepts in a key
+    return hashlib.md5(slug.encode()).hexdigest()
+
+
+def _version_key(slug):
+    return f'article:{_slug_key(slug)}:version'
+
+
+def _detail_key(slug, version):
+    return f'article:{_slug_key(slug)}:detail:{version}'
+
+
+def _new_version():
+    # a version that was evicted from the cache must not restart from a
+    # number that older entries may still be stored under
+    return int(time.time() * 1000000)
+
+
+def get_version(slug):
+    """
+    Get the current version of the article, starting it if there is none
+    :rtype: int
+    """
+    version = cache.get(_version_key(slug))
+    if version is None:
+        cache.add(_version_key(slug), _new_version(), None)
+        version = cache.get(_version_key(slug))
+    return version
+
+
+def get_collection_version():
+    """
+    Get the version of the article lists, starting it if there is none.
+    It is the time of the last write to any article, or later.
+    :rtype: int
+    """
+    version = cache.get(COLLECTION_VERSION_KEY)
+    if version is None:
+        cache.add(COLLECTION_VERSION_KEY, _new_version(), None)
+        version = cache.get(COLLECTION_VERSION_KEY)
+    return version
+
+
+def get_cached_detail(slug):
+    """
+    Only called once the article is known to exist, so that unknown slugs
+    do not start versions in the cache
+    :return: the current version of the article and its cached entry, which
+    is None on a cache miss
+    :rtype: tuple
+    """
+    version = get_version(slug)
+    return version, cache.get(_detail_key(slug, version))
+
+
+def cache_detail(slug, version, entry):
+    """
+    Store the serialized article and its validators under the version it
+    was read at
+    """
+    cache.set(_detail_key(slug, version), entry, settings.ARTICLE_CACHE_TTL)
+
+
+def _bump(slugs):
+    cache.set(COLLECTION_VERSION_KEY, _new_version(), None)
+    for slug in slugs:
+        try:
+            cache.incr(_version_key(slug))
+        except ValueError:
+            cache.set(_version_key(slug), _new_version(), None)
+
+
+def invalidate_article(*slugs):
+    """
+    Invalidate the cached responses of the articles with these slugs, and
+    the validators of the article lists. Without slugs, only the lists are
+    invalidated, as when articles are created. The versions are bumped
+    straight away and once more when the current transaction commits, so
+    that a response read from the database before the commit cannot stay
+    cached.
+    """
+    if not is_enabled():
+        return
+    slugs = [slug for slug in slugs if slug]
+    _bump(slugs)
+    transaction.on_commit(lambda: _bump(slugs))
@@ -0,0 +1,63 @@
+"""
+Validators for conditional GET requests on articles, so that clients
+holding a current copy get a 304 without the articles being serialized.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_collection_version
+
+
+def _etag(*parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode())
+    return quote_etag(digest.hexdigest())
+
+
+def article_validators(article):
+    """
+    :return: the ETag and Last-Modified timestamp of one article. The
+    reaction counters take part in the ETag along with the timestamps, and
+    so does the last update of the author embedded in the article.
+    :rtype: tuple
+    """
+    author = article.author
+    last_modified = max(article.last_modified, author.updated_at)
+    etag = _etag(article.pk, article.slug, article.updatedAt,
+                 article.reactedAt, article.likes_count,
+                 article.dislikes_count, article.favorites_count,
+                 author.pk, author.updated_at)
+    return etag, int(last_modified.timestamp())
+
+
+def collection_validators(request):
+    """
+    :return: the ETag and Last-Modified timestamp of a list of articles,
+    from the version of the article lists kept in the cache and the query
+    string, without querying the articles
+    :rtype: tuple
+    """
+    version = get_collection_version()
+    return _etag(request.get_full_path(), version), version // 1000000
+
+
+def not_modified(request, etag, last_modified):
+    """
+    :return: a 304 response if the client's copy matches the validators,
+    else None
+    """
+    response = get_conditional_response(request, etag=etag,
+                                        last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # the viewer's own reactions are part of the representation
+    patch_vary_headers(response, ('Authorization',))
+    return response
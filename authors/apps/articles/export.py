@@ -0,0 +1,88 @@
+"""
+Streaming export of all the articles as JSON lines or CSV.
+
+The articles are read through a server-side cursor a chunk at a time and
+each one is formatted as it is read, so the memory used does not depend on
+the number of articles. The field names and the JSON arrays in the CSV
+columns are those read by the `import_articles` command.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Article
+
+FORMATS = ('ndjson', 'csv')
+
+# The fields always exported, by model column
+FIELDS = (
+    ('id', 'id'),
+    ('slug', 'slug'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('body', 'content__text'),
+    ('createdAt', 'createdAt'),
+    ('updatedAt', 'updatedAt'),
+)
+
+# The fields exported on request, by the name of their group
+OPTIONAL_FIELDS = {
+    'author': (('author', 'author__username'),),
+    'tags': (('tagList', 'tagList'),),
+    'counts': (
+        ('likesCount', 'likes_count'),
+        ('dislikesCount', 'dislikes_count'),
+        ('favoritesCount', 'favorites_count'),
+        ('commentsCount', 'comments_count'),
+    ),
+}
+
+# Number of articles fetched from the server-side cursor at a time
+CHUNK_SIZE = 2000
+
+
+def export_fields(include=()):
+    """
+    :return: the exported field names and the columns they are read from
+    :rtype: tuple
+    """
+    fields = FIELDS + tuple(field for group in OPTIONAL_FIELDS
+                            if group in include
+                            for field in OPTIONAL_FIELDS[group])
+    return tuple(zip(*fields))
+
+
+def export_rows(columns):
+    """
+    Yield the values of every article, in the order of the columns
+    """
+    return Article.objects.order_by('pk').values_list(*columns) \
+        .iterator(chunk_size=CHUNK_SIZE)
+
+
+class _Line:
+    """File-like object handing back what the CSV writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(output, include=()):
+    """
+    Yield the export of all the articles a line at a time.
+    :param output: one of `FORMATS`
+    :param include: the names of the `OPTIONAL_FIELDS` groups to export
+    """
+    names, columns = export_fields(include)
+    if output == 'csv':
+        writer = csv.writer(_Line())
+        yield writer.writerow(names)
+        for row in export_rows(columns):
+            yield writer.writerow([
+                json.dumps(value) if isinstance(value, list) else value
+                for value in row])
+    else:
+        for row in export_rows(columns):
+            yield json.dumps(dict(zip(names, row)),
+                             cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,321 @@
+"""
+Bulk loading of articles from another platform, used by the
+`import_articles` command.
+
+Every batch of records is loaded in one transaction: the articles are
+streamed into a temporary table with `COPY`, then inserted from it in a
+single statement that skips the slugs already present. Records without a
+slug get one derived from their content, so loading the same records again
+inserts nothing and an interrupted import can simply be restarted.
+"""
+import io
+import json
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from .cache import invalidate_article
+from .models import Article, ArticleBody, Reaction, TimelineEntry, \
+    reading_stats, search_document
+from ..authentication.models import User
+
+# Namespace of the slugs generated for the imported articles
+SLUG_NAMESPACE = uuid.UUID('8a5d3f4e-3c1b-4f0e-9a63-2f1c6f0b7d21')
+
+# The article columns loaded through COPY, the counters start at zero and
+# are rebuilt from the imported reactions. The bodies go to their own table
+COLUMNS = ('slug', 'title', 'description', 'images', 'tagList',
+           'author', 'createdAt', 'updatedAt', 'word_count',
+           'reading_time_minutes', 'excerpt', 'fanned_out')
+
+
+class InvalidRecord(ValueError):
+    """A record that cannot be imported"""
+
+
+def record_slug(record):
+    """
+    :return: the record's own slug, or one derived from its title and
+    content that is the same every time the record is imported
+    :rtype: str
+    """
+    if record.get('slug'):
+        return record['slug']
+    content = json.dumps(record, sort_keys=True, default=str)
+    key = uuid.uuid5(SLUG_NAMESPACE, content).hex
+    return f"{slugify(record['title'])}-{key}"
+
+
+def _array(values):
+    """Format a list of strings as a PostgreSQL array literal"""
+    if values is None:
+        return None
+    items = (str(value).replace('\\', '\\\\').replace('"', '\\"')
+             for value in values)
+    return '{' + ','.join(f'"{item}"' for item in items) + '}'
+
+
+def _copy_value(value):
+    """Format a value for the text format of COPY"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t') \
+        .replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _list(record, key):
+    values = record.get(key)
+    if values in (None, ''):
+        return None
+    if isinstance(values, str):
+        # CSV columns hold JSON arrays
+        try:
+            values = json.loads(values)
+        except ValueError:
+            raise InvalidRecord(f'{key} is not a JSON array')
+    if not isinstance(values, list):
+        raise InvalidRecord(f'{key} is not a list')
+    return values
+
+
+class ArticleImporter:
+    """
+    Imports batches of article records. The records are dicts with the
+    `title`, `description`, `body` and `author` username of the article,
+    and optionally its `slug`, `tagList`, `images`, `createdAt` and
+    `updatedAt`, and the usernames of the users who `favorited`, `likes` or
+    `dislikes` it.
+    """
+
+    def __init__(self):
+        # whether the articles of each author are copied into timelines,
+        # worked out once per author for the whole import
+        self.fans_out = {}
+
+    @staticmethod
+    def clean(record):
+        """
+        Check the record and parse its list fields.
+        :return: the cleaned record
+        :rtype: dict
+        """
+        for key in ('title', 'body', 'author'):
+            if not record.get(key):
+                raise InvalidRecord(f'{key} is missing')
+        record = dict(record, description=record.get('description') or '')
+        for key in ('title', 'description', 'body', 'author', 'slug'):
+            if record.get(key) is not None and \
+                    not isinstance(record[key], str):
+                raise InvalidRecord(f'{key} is not text')
+        if len(record['title']) > 100 or len(record['description']) > 100:
+            raise InvalidRecord('title or description is too long')
+        for key in ('images', 'tagList', 'favorited', 'likes', 'dislikes'):
+            record[key] = _list(record, key)
+        for key in ('createdAt', 'updatedAt'):
+            if record.get(key):
+                try:
+                    record[key] = parse_datetime(record[key])
+                except (TypeError, ValueError):
+                    # well formed but out of range, or not a string
+                    record[key] = None
+                if record[key] is None:
+                    raise InvalidRecord(f'{key} is not a date')
+        return record
+
+    @staticmethod
+    def resolve_users(records):
+        """
+        :return: the ids of all the users named in the records by username,
+        in one query
+        :rtype: dict
+        """
+        usernames = set()
+        for record in records:
+            usernames.add(record['author'])
+            for key in ('favorited', 'likes', 'dislikes'):
+                usernames.update(record[key] or ())
+        return dict(User.objects.filter(username__in=usernames)
+                    .values_list('username', 'id'))
+
+    def resolve_fan_out(self, author_ids):
+        missing = set(author_ids) - set(self.fans_out)
+        if not missing:
+            return
+        limit = settings.FEED_FANOUT_LIMIT
+        popular = set(User.follows.through.objects
+                      .filter(to_user__in=missing).values('to_user')
+                      .annotate(followers=Count('*'))
+                      .filter(followers__gt=limit)
+                      .values_list('to_user', flat=True))
+        self.fans_out.update(
+            (author, author not in popular) for author in missing)
+
+    def prepare(self, record, slug, author, now):
+        """
+        :return: the article row of a cleaned record, in the order of
+        `COLUMNS`
+        :rtype: tuple
+        """
+        created = record.get('createdAt') or now
+        words, minutes, excerpt = reading_stats(record['body'])
+        return (slug, record['title'], record['description'],
+                _array(record['images']), _array(record['tagList']), author,
+                created, record.get('updatedAt') or created, words, minutes,
+                excerpt, self.fans_out[author])
+
+    def import_batch(self, records):
+        """
+        Import a batch of records in one transaction.
+        :return: the number of articles created and the errors of the
+        records that were skipped, by their position in the batch
+        :rtype: tuple
+        """
+        errors, cleaned = {}, {}
+        for position, record in enumerate(records):
+            try:
+                cleaned[position] = self.clean(record)
+            except InvalidRecord as error:
+                errors[position] = str(error)
+
+        users = self.resolve_users(cleaned.values())
+        authors = {}
+        for position, record in cleaned.items():
+            if record['author'] in users:
+                authors[position] = users[record['author']]
+            else:
+                errors[position] = f"unknown author {record['author']}"
+        self.resolve_fan_out(authors.values())
+
+        now = timezone.now()
+        rows, by_slug = [], {}
+        for position, author in authors.items():
+            # the slug is derived from the record as it was read
+            slug = record_slug(records[position])
+            if slug in by_slug:
+                # only one of them could be inserted, with the wrong body
+                errors[position] = f'duplicate slug {slug}'
+                continue
+            rows.append(self.prepare(cleaned[position], slug, author, now))
+            by_slug[slug] = cleaned[position]
+
+        with transaction.atomic():
+            created = self.copy_articles(rows)
+            self.add_bodies(created, by_slug)
+            self.add_reactions(created, by_slug, users)
+            articles = Article.objects.filter(pk__in=created.values())
+            articles.update(search_vector=search_document())
+            articles.rebuild_reaction_counts()
+            self.fan_out(list(created.values()))
+            # the new articles change the lists
+            invalidate_article()
+        return len(created), errors
+
+    def copy_articles(self, rows):
+        """
+        Insert the article rows whose slug is not taken yet.
+        :return: the ids of the inserted articles by slug
+        :rtype: dict
+        """
+        if not rows:
+            return {}
+        data = io.StringIO()
+        for row in rows:
+            data.write('\t'.join(_copy_value(value) for value in row))
+            data.write('\n')
+        data.seek(0)
+
+        table = Article._meta.db_table
+        columns = ', '.join(f'"{column}"' for column in COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE article_import ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {table} WITH NO DATA')
+            cursor.copy_expert(
+                f'COPY article_import ({columns}) FROM STDIN', data)
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}, likes_count, '
+                f'dislikes_count, favorites_count, comments_count) '
+                f'SELECT {columns}, 0, 0, 0, 0 '
+                f'FROM article_import ON CONFLICT (slug) DO NOTHING '
+                f'RETURNING slug, id')
+            created = dict(cursor.fetchall())
+            cursor.execute('DROP TABLE article_import')
+        return created
+
+    @staticmethod
+    def add_bodies(created, records):
+        """
+        Insert the bodies of the new articles in one statement
+        """
+        if not created:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {ArticleBody._meta.db_table} (article_id, text) '
+                f'SELECT * FROM unnest(%s::int[], %s::text[])',
+                [list(created.values()),
+                 [records[slug]['body'] for slug in created]])
+
+    @staticmethod
+    def add_reactions(created, records, users):
+        """
+        Insert the favorites, likes and dislikes of the new articles, a
+        statement per table
+        """
+        favorites = ([], [])
+        reactions = ([], [], [])
+        for slug, article in created.items():
+            record = records[slug]
+            for username in record['favorited'] or ():
+                if username in users:
+                    favorites[0].append(article)
+                    favorites[1].append(users[username])
+            for key, kind in (('likes', Reaction.LIKE),
+                              ('dislikes', Reaction.DISLIKE)):
+                for username in record[key] or ():
+                    if username in users:
+                        reactions[0].append(article)
+                        reactions[1].append(users[username])
+                        reactions[2].append(kind)
+
+        with connection.cursor() as cursor:
+            if favorites[0]:
+                cursor.execute(
+                    f'INSERT INTO {Article.favorited.through._meta.db_table} '
+                    f'(article_id, user_id) '
+                    f'SELECT * FROM unnest(%s::int[], %s::int[]) '
+                    f'ON CONFLICT DO NOTHING', favorites)
+            if reactions[0]:
+                # a user both liking and disliking keeps their first reaction
+                cursor.execute(
+                    f'INSERT INTO {Reaction._meta.db_table} '
+                    f'(article_id, user_id, kind, "createdAt") '
+                    f'SELECT *, now() '
+                    f'FROM unnest(%s::int[], %s::int[], %s::varchar[]) '
+                    f'ON CONFLICT DO NOTHING', reactions)
+
+    @staticmethod
+    def fan_out(article_ids):
+        """
+        Copy the new articles into the timelines of their authors' followers
+        """
+        if not article_ids:
+            return
+        follows = User.follows.through._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {TimelineEntry._meta.db_table} '
+                f'(user_id, article_id, author_id, "createdAt") '
+                f'SELECT follows.from_user_id, article.id, article.author, '
+                f'article."createdAt" FROM {Article._meta.db_table} article '
+                f'JOIN {follows} follows '
+                f'ON follows.to_user_id = article.author '
+                f'WHERE article.id = ANY(%s) AND article.fanned_out '
+                f'ON CONFLICT DO NOTHING', [article_ids])
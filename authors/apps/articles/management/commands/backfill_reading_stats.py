@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from authors.apps.articles.cache import invalidate_article
+from authors.apps.articles.models import Article, reading_stats
+
+
+class Command(BaseCommand):
+    """
+    Compute the word count, reading time and excerpt of the articles saved
+    before these were stored. Each batch of articles is written back with a
+    single UPDATE.
+    """
+    help = 'Store the reading statistics and excerpts of existing articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles updated per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        bounds = Article.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        updated = 0
+
+        if bounds['first'] is None:
+            self.stdout.write('There are no articles to update')
+            return
+
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            with transaction.atomic():
+                updated += self.update_batch(
+                    Article.objects.filter(pk__gte=start,
+                                           pk__lt=start + batch_size))
+            self.stdout.write(f'Updated {updated} articles')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done, {updated} articles updated'))
+
+    @staticmethod
+    def update_batch(articles):
+        rows, slugs = [], []
+        bodies = articles.values_list('pk', 'slug', 'content__text')
+        for pk, slug, body in bodies:
+            rows.append((pk,) + reading_stats(body or ''))
+            slugs.append(slug)
+        if not rows:
+            return 0
+        values = ', '.join(['(%s, %s, %s, %s)'] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {Article._meta.db_table} AS article '
+                f'SET word_count = stats.words, '
+                f'reading_time_minutes = stats.minutes, '
+                f'excerpt = stats.excerpt '
+                f'FROM (VALUES {values}) '
+                f'AS stats (id, words, minutes, excerpt) '
+                f'WHERE article.id = stats.id',
+                [value for row in rows for value in row])
+        invalidate_article(*slugs)
+        return len(rows)
@@ -0,0 +1,137 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from authors.apps.articles.importer import ArticleImporter
+from authors.apps.articles.models import Article
+from authors.apps.articles.pagination import KeysetPagination
+from authors.apps.articles.serializers import ArticleSerializer
+from authors.apps.articles.views import ArticleList
+from authors.apps.authentication.models import User
+
+
+class Command(BaseCommand):
+    """
+    Seed a large number of articles and compare serving pages of the
+    article list as they are served, without the bodies, with serving them
+    along with the bodies as the list did before they were moved to their
+    own table. Each page goes through the list view, from its queryset to
+    the rendered response, for the first and a deep page with cursors and
+    with `limit`/`offset` and its count, with a tag filter and with a full
+    text search. The seeded articles are rolled back at the end unless
+    `--keep` is given.
+    """
+    help = (
+        'Time pages of the article list with and without the article '
+        'bodies: the first and a middle page with cursors and with '
+        'limit/offset and its count, a tag filter and a full text search. '
+        'The pages are served to an anonymous client without the list '
+        'validators, so the viewer\'s reactions and the 304 answers are '
+        'not measured. The bodies are read through the join on their '
+        'table, not from the article rows as they used to be, and the '
+        'seeded articles all have bodies of the same length.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int, default=10000,
+            help='Number of articles to seed')
+        parser.add_argument(
+            '--body-words', type=int, default=1500,
+            help='Number of words in each seeded body')
+        parser.add_argument(
+            '--page-size', type=int, default=20,
+            help='Number of articles in the page')
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help='Number of times each page is served, the best run is kept')
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Keep the seeded articles')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['articles'], options['body_words'])
+
+            fields = ArticleSerializer.list_fields()
+            for scenario, query in self.scenarios(
+                    options['articles'], options['page_size']):
+                for label, extra in (
+                        ('without bodies', {}),
+                        ('with bodies',
+                         {'fields': ','.join(fields + ('body',))})):
+                    seconds, peak = self.measure(
+                        dict(query, **extra), options['runs'])
+                    self.stdout.write(
+                        f'{scenario}, {label}: {seconds * 1000:.1f} ms, '
+                        f'{peak / 2 ** 20:.1f} MiB')
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def seed(self, count, body_words):
+        author, _ = User.objects.get_or_create(
+            username='benchmark', email='benchmark@example.com')
+        body = ' '.join(['lorem'] * body_words)
+        importer = ArticleImporter()
+        for start in range(0, count, 1000):
+            importer.import_batch([
+                {'title': f'Benchmark {number}', 'description': 'Benchmark',
+                 'body': f'{number} {body}', 'author': author.username,
+                 'tagList': ['benchmark', f'tag{number % 10}']}
+                for number in range(start, min(start + 1000, count))])
+        self.stdout.write(f'Seeded {count} articles')
+
+    @staticmethod
+    def scenarios(count, page_size):
+        """
+        :return: the name and query string of every page served
+        :rtype: tuple
+        """
+        middle = KeysetPagination.encode_cursor(
+            Article.objects.order_by('-createdAt', '-id')
+            .only('id', 'createdAt')[count // 2])
+        return (
+            ('first page', {'page_size': page_size}),
+            ('middle page', {'page_size': page_size, 'cursor': middle}),
+            ('first page with count', {'limit': page_size, 'offset': 0}),
+            ('middle page with count', {'limit': page_size,
+                                        'offset': count // 2}),
+            ('tag filter', {'page_size': page_size, 'tag': 'tag3'}),
+            ('full text search', {'limit': page_size, 'q': 'lorem'}),
+        )
+
+    @staticmethod
+    def serve(query):
+        """
+        Serve a page of the article list to an anonymous client
+        :rtype: Response
+        """
+        request = APIRequestFactory().get(
+            reverse('articles:all_articles'), query, SERVER_NAME='localhost')
+        response = ArticleList.as_view()(request)
+        return response.render()
+
+    def measure(self, query, runs):
+        """
+        :return: the best time taken to serve the page and the memory
+        allocated while serving it
+        :rtype: tuple
+        """
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.serve(query)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracemalloc.start()
+        try:
+            self.serve(query)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return best, peak
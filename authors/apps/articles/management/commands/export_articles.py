@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.export import FORMATS, OPTIONAL_FIELDS, \
+    export_lines
+
+
+class Command(BaseCommand):
+    """
+    Write all the articles as JSON lines or CSV, reading them through a
+    server-side cursor so that the memory used stays the same however many
+    articles there are.
+    """
+    help = 'Export all the articles as JSON lines or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', choices=FORMATS, default='ndjson',
+            help='The format of the export')
+        parser.add_argument(
+            '--include', nargs='*', choices=sorted(OPTIONAL_FIELDS),
+            default=(), help='Groups of fields added to the export')
+        parser.add_argument(
+            '--file', default=None,
+            help='The file to write, standard output by default')
+
+    def handle(self, *args, **options):
+        lines = export_lines(options['output'], options['include'])
+        if options['file'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['file'], 'w', newline='') as export:
+            export.writelines(lines)
@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.importer import ArticleImporter
+
+
+class Command(BaseCommand):
+    """
+    Import articles from a JSON lines or CSV file, in batches that are each
+    loaded in one transaction. In CSV files the `tagList`, `images`,
+    `favorited`, `likes` and `dislikes` columns hold JSON arrays.
+
+    Importing the same records again creates nothing, so an interrupted
+    import can be run again from the start. With `--checkpoint` the number
+    of records already imported is kept in a file, and a restarted import
+    skips straight past them.
+    """
+    help = 'Import articles from a JSON lines or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='The file to import, - to read standard input')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default=None,
+            help='The format of the file, guessed from its extension '
+                 'by default')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of records imported per transaction')
+        parser.add_argument(
+            '--checkpoint', default=None,
+            help='File recording how many records have been imported')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or \
+            ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        done = self.read_checkpoint(options['checkpoint'])
+        importer = ArticleImporter()
+        imported = skipped = 0
+
+        source = sys.stdin if path == '-' else open(path, newline='')
+        try:
+            records = self.read(source, file_format)
+            # the records imported before the import was interrupted
+            for _ in islice(records, done):
+                pass
+            while True:
+                batch = list(islice(records, options['batch_size']))
+                if not batch:
+                    break
+                created, errors = importer.import_batch(
+                    [record for record in batch if record is not None])
+                imported += created
+                skipped += len(errors) + batch.count(None)
+                self.report_errors(done, batch, errors)
+                done += len(batch)
+                self.write_checkpoint(options['checkpoint'], done)
+                self.stdout.write(
+                    f'{done} records read, {imported} articles imported, '
+                    f'{skipped} records skipped')
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done, {imported} articles imported'))
+
+    def read(self, source, file_format):
+        """
+        Yield the records of the file, None for a line that is not a JSON
+        object
+        """
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+    def report_errors(self, done, batch, errors):
+        valid = [number for number, record in enumerate(batch, done + 1)
+                 if record is not None]
+        for number, record in enumerate(batch, done + 1):
+            if record is None:
+                self.stderr.write(f'Record {number}: not a JSON object')
+        for position, error in sorted(errors.items()):
+            self.stderr.write(f'Record {valid[position]}: {error}')
+
+    @staticmethod
+    def read_checkpoint(path):
+        if path is None or not os.path.exists(path):
+            return 0
+        with open(path) as checkpoint:
+            try:
+                return int(checkpoint.read().strip() or 0)
+            except ValueError:
+                raise CommandError(f'{path} is not a checkpoint file')
+
+    @staticmethod
+    def write_checkpoint(path, done):
+        if path is None:
+            return
+        # replaced in one step so that an interruption cannot corrupt it
+        with open(path + '.tmp', 'w') as checkpoint:
+            checkpoint.write(str(done))
+        os.replace(path + '.tmp', path)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from authors.apps.articles.cache import invalidate_article
+from authors.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the stored likes, dislikes and favorites counters of every
+    article from the join tables. Used to backfill existing data and to
+    repair counters that have drifted.
+    """
+    help = 'Recompute the reaction counters stored on articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles updated per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        bounds = Article.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        updated = 0
+
+        if bounds['first'] is None:
+            self.stdout.write('There are no articles to update')
+            return
+
+        # update in id ranges so that each transaction only locks a batch
+        # of rows at a time
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            articles = Article.objects.filter(pk__gte=start,
+                                              pk__lt=start + batch_size)
+            with transaction.atomic():
+                updated += articles.rebuild_reaction_counts()
+                invalidate_article(*articles.values_list('slug', flat=True))
+            self.stdout.write(f'Rebuilt counters for {updated} articles')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done, {updated} articles updated'))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import TrendingScore
+
+
+class Command(BaseCommand):
+    """
+    Refresh the stored trending scores of the articles that have been
+    created, reacted to, rated or commented on since the previous refresh,
+    so that each run costs as much as the activity since the last one.
+    """
+    help = 'Refresh the trending scores of articles with new activity'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Recompute the scores of all the articles')
+        parser.add_argument(
+            '--interval', type=int, default=None,
+            help='Keep refreshing, waiting this many seconds between runs')
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            refreshed = TrendingScore.objects.refresh(full=full)
+            self.stdout.write(self.style.SUCCESS(
+                f'Refreshed the trending scores of {refreshed} articles'))
+            if options['interval'] is None:
+                return
+            full = False
+            time.sleep(options['interval'])
@@ -0,0 +1,41 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+# The counters start from the reactions the existing articles already have,
+# or removing one of those would take them below zero
+BACKFILL_COUNTERS = """
+UPDATE articles_article SET
+    likes_count = (SELECT COUNT(*) FROM articles_article_likes
+                   WHERE article_id = articles_article.id),
+    dislikes_count = (SELECT COUNT(*) FROM articles_article_dislikes
+                      WHERE article_id = articles_article.id),
+    favorites_count = (SELECT COUNT(*) FROM articles_article_favorited
+                       WHERE article_id = articles_article.id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_COUNTERS, migrations.RunSQL.noop),
+    ]
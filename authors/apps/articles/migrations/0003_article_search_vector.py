@@ -0,0 +1,36 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Builds the same weighted document as `articles.models.search_document`
+BACKFILL_SEARCH_VECTOR = """
+UPDATE articles_article SET search_vector =
+    setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig,
+                          COALESCE(description, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig,
+                          COALESCE(array_to_string("tagList", ' '), '')),
+              'B') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(body, '')), 'C');
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_article_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR, migrations.RunSQL.noop),
+    ]
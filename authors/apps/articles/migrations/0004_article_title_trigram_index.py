@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_article_search_vector'),
+        ('authentication', '0004_username_trigram_index'),
+    ]
+
+    operations = [
+        # Matches the `UPPER(title::text)` expression used by both the
+        # `icontains` lookup and the trigram similarity filter
+        migrations.RunSQL(
+            'CREATE INDEX article_title_trgm_idx ON articles_article '
+            'USING gin (UPPER(title::text) gin_trgm_ops);',
+            'DROP INDEX IF EXISTS article_title_trgm_idx;'),
+    ]
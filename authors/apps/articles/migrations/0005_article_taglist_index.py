@@ -0,0 +1,18 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_article_title_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tagList'], name='article_taglist_idx'),
+        ),
+    ]
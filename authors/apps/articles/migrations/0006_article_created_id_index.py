@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_article_taglist_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['createdAt', 'id'], name='article_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='reactedAt',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
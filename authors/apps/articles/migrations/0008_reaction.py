@@ -0,0 +1,66 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Moves the likes and dislikes join tables into the reactions table. A user
+# found in both keeps their like, so the counters are recomputed, along with
+# the favorites count for databases whose counters were never backfilled.
+COPY_REACTIONS = """
+INSERT INTO articles_reaction (user_id, article_id, kind, "createdAt")
+SELECT user_id, article_id, 'like', now() FROM articles_article_likes
+ON CONFLICT DO NOTHING;
+INSERT INTO articles_reaction (user_id, article_id, kind, "createdAt")
+SELECT user_id, article_id, 'dislike', now() FROM articles_article_dislikes
+ON CONFLICT DO NOTHING;
+UPDATE articles_article SET
+    likes_count = (SELECT COUNT(*) FROM articles_reaction
+                   WHERE article_id = articles_article.id AND kind = 'like'),
+    dislikes_count = (SELECT COUNT(*) FROM articles_reaction
+                      WHERE article_id = articles_article.id
+                      AND kind = 'dislike'),
+    favorites_count = (SELECT COUNT(*) FROM articles_article_favorited
+                       WHERE article_id = articles_article.id);
+"""
+
+RESTORE_REACTIONS = """
+INSERT INTO articles_article_likes (article_id, user_id)
+SELECT article_id, user_id FROM articles_reaction WHERE kind = 'like';
+INSERT INTO articles_article_dislikes (article_id, user_id)
+SELECT article_id, user_id FROM articles_reaction WHERE kind = 'dislike';
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0007_article_reactedat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('like', 'Like'), ('dislike', 'Dislike')], max_length=7)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='articles.Article')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_reactions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='reaction',
+            unique_together={('user', 'article')},
+        ),
+        migrations.RunSQL(COPY_REACTIONS, RESTORE_REACTIONS),
+        migrations.RemoveField(
+            model_name='article',
+            name='dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='article',
+            name='likes',
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_reaction'),
+    ]
+
+    operations = [
+        # Key of the cursor pagination of an article's favoriters, the
+        # automatically created join table cannot declare it in its Meta
+        migrations.RunSQL(
+            'CREATE INDEX article_favorited_article_id_idx '
+            'ON articles_article_favorited (article_id, id);',
+            'DROP INDEX IF EXISTS article_favorited_article_id_idx;'),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Copy the articles already published into the timelines of the current
+# followers of their authors
+FILL_TIMELINES = '''
+INSERT INTO articles_timelineentry (user_id, article_id, author_id, "createdAt")
+SELECT follows.from_user_id, article.id, article.author, article."createdAt"
+FROM articles_article article
+JOIN authentication_user_follows follows ON follows.to_user_id = article.author
+ON CONFLICT DO NOTHING;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0010_slughistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='fanned_out',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', 'createdAt', 'article'], name='timeline_user_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('user', 'article')},
+        ),
+        migrations.RunSQL(FILL_TIMELINES, migrations.RunSQL.noop),
+        # the feed reads the articles that were not copied into the
+        # timelines straight from the articles table
+        migrations.RunSQL(
+            'CREATE INDEX article_not_fanned_out_idx ON articles_article '
+            '(author, "createdAt", id) WHERE NOT fanned_out;',
+            'DROP INDEX IF EXISTS article_not_fanned_out_idx;'),
+    ]
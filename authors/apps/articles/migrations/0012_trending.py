@@ -0,0 +1,30 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='articles.Article')),
+                ('score', models.FloatField()),
+                ('computedAt', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['reactedAt'], name='article_reactedat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['-score'], name='trending_score_idx'),
+        ),
+    ]
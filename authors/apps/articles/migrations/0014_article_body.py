@@ -0,0 +1,36 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Move the bodies into their own table, and back when unapplied
+MOVE_BODIES = (
+    'INSERT INTO articles_articlebody (article_id, text) '
+    'SELECT id, body FROM articles_article'
+)
+RESTORE_BODIES = (
+    'UPDATE articles_article SET body = articles_articlebody.text '
+    'FROM articles_articlebody '
+    'WHERE articles_articlebody.article_id = articles_article.id'
+)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_article_reading_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleBody',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='content', serialize=False, to='articles.Article')),
+                ('text', models.TextField()),
+            ],
+        ),
+        migrations.RunSQL(MOVE_BODIES, RESTORE_BODIES),
+        migrations.RemoveField(
+            model_name='article',
+            name='body',
+        ),
+    ]
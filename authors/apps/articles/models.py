@@ -1,14 +1,131 @@
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connection, models, transaction
+from django.db.models import Avg, CharField, Count, F, FloatField, Func, \
+    IntegerField, Max, OuterRef, Q, Subquery, Sum, TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
 
+from .cache import invalidate_article
 from ..authentication.models import User
+from ..ratings.models import Rating
+
+
+def _count_subquery(model, field='article', **filters):
+    """
+    Build a correlated sub-query counting the rows of `model` that point at
+    the outer article, so that several counts can be annotated onto one
+    SELECT without the row multiplication caused by joining the tables.
+    """
+    rows = model.objects.filter(**{field: OuterRef('pk')}, **filters) \
+        .order_by() \
+        .values(field).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+# The text search configuration used both to build and to query the vectors
+SEARCH_CONFIG = 'english'
+
+
+def search_document():
+    """
+    Expression building the weighted `tsvector` of an article from its
+    title, description, tags and body, in that order of importance.
+    """
+    tags = Func(F('tagList'), Value(' '), function='array_to_string',
+                output_field=TextField())
+    body = Subquery(ArticleBody.objects.filter(article=OuterRef('pk'))
+                    .values('text'), output_field=TextField())
+    return (SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+            SearchVector('description', weight='B', config=SEARCH_CONFIG) +
+            SearchVector(tags, weight='B', config=SEARCH_CONFIG) +
+            SearchVector(body, weight='C', config=SEARCH_CONFIG))
+
+
+# Reading speed used for the reading time, in words per minute
+WORDS_PER_MINUTE = 200
+
+# Maximum length of the plain text excerpt of an article
+EXCERPT_LENGTH = 300
+
+
+def reading_stats(body):
+    """
+    Work out the word count, reading time in minutes and plain text excerpt
+    of an article body
+    :rtype: tuple
+    """
+    words = strip_tags(body).split()
+    minutes = -(-len(words) // WORDS_PER_MINUTE)
+    excerpt = Truncator(' '.join(words)).chars(EXCERPT_LENGTH)
+    return len(words), minutes, excerpt
+
+
+# An article needs ten times the activity of one published this many seconds
+# earlier to be ranked level with it in the trending articles
+TRENDING_TIMESCALE = 45000
+
+
+def trending_points():
+    """
+    Expression weighing the likes, dislikes, favorites, ratings and comments
+    of an article into the points its trending score is computed from
+    """
+    ratings = Rating.objects.filter(article=OuterRef('pk')).order_by() \
+        .values('article').annotate(balance=Sum(F('stars') - 3)) \
+        .values('balance')
+    Comment = apps.get_model('comments', 'Comment')
+
+    # a rating of three stars counts as neither for nor against
+    return (F('likes_count') - F('dislikes_count') +
+            2 * F('favorites_count') +
+            Coalesce(Subquery(ratings, output_field=IntegerField()), 0) +
+            _count_subquery(Comment))
+
+
+class ArticleQuerySet(models.QuerySet):
+    """Custom queryset holding the read-path helpers for articles"""
+
+    def with_stats(self):
+        """
+        Annotate every article with its rating aggregates. These are computed
+        in the same SQL statement that fetches the articles, which the
+        serializer then reads instead of querying once per article. Reaction
+        counts are stored on the article itself.
+        """
+        ratings = Rating.objects.filter(article=OuterRef('pk')).order_by() \
+            .values('article')
+
+        return self.annotate(
+            ratings_total=_count_subquery(Rating),
+            average_rating=Subquery(
+                ratings.annotate(average=Avg('stars')).values('average'),
+                output_field=FloatField()),
+        )
+
+    def rebuild_reaction_counts(self):
+        """
+        Recompute the stored reaction counters of the articles in this
+        queryset from the reactions and favorites tables.
+        :return: the number of articles updated
+        :rtype: int
+        """
+        return self.update(
+            likes_count=_count_subquery(Reaction, kind=Reaction.LIKE),
+            dislikes_count=_count_subquery(Reaction, kind=Reaction.DISLIKE),
+            favorites_count=_count_subquery(Article.favorited.through),
+        )
 
 
 class Article(models.Model):
     """This is a model for storing articles in the database"""
     slug = models.CharField(max_length=200, null=True, blank=True, unique=True)
     title = models.CharField(max_length=100)
-    body = models.TextField()
     description = models.CharField(max_length=100)
     images = ArrayField(
         models.CharField(max_length=1000, blank=True),
@@ -17,6 +134,9 @@ class Article(models.Model):
         blank=True)
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
+    # Last time the article was reacted to or rated, used with `updatedAt`
+    # to tell clients whether their copy is still current
+    reactedAt = models.DateTimeField(null=True, blank=True, editable=False)
 
     tagList = ArrayField(
         models.CharField(max_length=200), null=True, blank=True)
@@ -24,16 +144,578 @@ class Article(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                db_column='author')
 
-    likes = models.ManyToManyField(User, related_name='likes', blank=True)
-    dislikes = models.ManyToManyField(
-        User, related_name='dislikes', blank=True)
     favorited = models.ManyToManyField(User, related_name='favorited',
                                        blank=True)
 
+    # Denormalized reaction counters, kept in step with the `Reaction` table
+    # and the favorites join table by the reaction and favorite methods below
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+    favorites_count = models.PositiveIntegerField(default=0)
+    # kept in step with the comments by the comments app's signals
+    comments_count = models.PositiveIntegerField(default=0)
+
+    # Pre-computed full text search document, refreshed on every save
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Derived from the body when the article is saved, so that lists can
+    # show them without loading the body
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time_minutes = models.PositiveIntegerField(default=0,
+                                                       editable=False)
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True,
+                               default='', editable=False)
+
+    # Whether the article was copied into the timelines of its author's
+    # followers when it was published, see `TimelineEntry`
+    fanned_out = models.BooleanField(default=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
     def __str__(self):
         # IMPORTANT to distinguish between printing the title only and the
         # Article object itself
         return f'Article: <{self.title}>'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the slug the article was loaded with, its cached responses
+        # must be invalidated even if the slug is changed
+        instance._loaded_slug = instance.__dict__.get('slug')
+        return instance
+
+    # The body set on the article and not saved yet
+    _new_body = None
+
+    @property
+    def body(self):
+        """
+        The body of the article, stored in its own `ArticleBody` table and
+        only read when it is asked for, or with `select_related('content')`
+        """
+        if self._new_body is not None:
+            return self._new_body
+        try:
+            return self.content.text
+        except ArticleBody.DoesNotExist:
+            return ''
+
+    @body.setter
+    def body(self, text):
+        self._new_body = text
+
+    def save(self, *args, **kwargs):
+        old_slug = getattr(self, '_loaded_slug', None)
+        adding = self._state.adding
+        body = self._new_body
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'body' not in update_fields:
+                body = None
+            update_fields.discard('body')
+        if body is not None:
+            self.word_count, self.reading_time_minutes, self.excerpt = \
+                reading_stats(body)
+            if update_fields is not None:
+                update_fields |= {
+                    'word_count', 'reading_time_minutes', 'excerpt'}
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+
+        with transaction.atomic():
+            if adding:
+                self.fanned_out = TimelineEntry.objects.can_fan_out(
+                    self.author)
+            super().save(*args, **kwargs)
+            if body is not None:
+                ArticleBody.objects.store(self, body)
+                self._new_body = None
+            if adding and self.fanned_out:
+                TimelineEntry.objects.fan_out(self)
+
+            # the search vector is built by the database from the saved
+            # columns
+            if update_fields is None or body is not None or \
+                    update_fields & {'title', 'description', 'tagList'}:
+                Article.objects.filter(pk=self.pk).update(
+                    search_vector=search_document())
+
+            if old_slug and old_slug != self.slug:
+                SlugHistory.objects.record(self, old_slug)
+
+        invalidate_article(old_slug, self.slug)
+        self._loaded_slug = self.slug
+
+    def delete(self, *args, **kwargs):
+        invalidate_article(getattr(self, '_loaded_slug', None), self.slug)
+        return super().delete(*args, **kwargs)
+
+    def _shift_counters(self, **amounts):
+        """
+        Move the counters by the given amounts in the database and reload
+        them on this instance.
+        """
+        changes = {counter: F(counter) + amount
+                   for counter, amount in amounts.items() if amount}
+        if not changes:
+            return
+        self.reactedAt = timezone.now()
+        Article.objects.filter(pk=self.pk).update(
+            reactedAt=self.reactedAt, **changes)
+        self.refresh_from_db(fields=list(changes))
+        invalidate_article(self.slug)
+
+    def mark_reacted(self):
+        """
+        Record that the reactions or ratings of the article have changed
+        """
+        self.reactedAt = timezone.now()
+        Article.objects.filter(pk=self.pk).update(reactedAt=self.reactedAt)
+        invalidate_article(self.slug)
+
+    @property
+    def last_modified(self):
+        """
+        When anything shown in the article's representation last changed
+        :rtype: datetime
+        """
+        if self.reactedAt is None:
+            return self.updatedAt
+        return max(self.updatedAt, self.reactedAt)
+
+    def _count_reaction_change(self, previous, current):
+        if previous == current:
+            return
+        amounts = {}
+        if previous is not None:
+            amounts[Reaction.COUNTERS[previous]] = -1
+        if current is not None:
+            amounts[Reaction.COUNTERS[current]] = 1
+        self._shift_counters(**amounts)
+
+    def set_reaction(self, user, kind):
+        """
+        Set the user's reaction to the article: `Reaction.LIKE`,
+        `Reaction.DISLIKE` or None for no reaction. Setting the same state
+        twice changes nothing.
+        :return: the user's previous reaction
+        :rtype: str or None
+        """
+        with transaction.atomic():
+            if kind is None:
+                previous = Reaction.objects.clear(self, user)
+            else:
+                previous = Reaction.objects.set_state(self, user, kind)
+            self._count_reaction_change(previous, kind)
+        return previous
+
+    def toggle_reaction(self, user, kind):
+        """
+        Give the article the user's `kind` of reaction, or remove it if the
+        user had already reacted that way.
+        :return: the user's new reaction
+        :rtype: str or None
+        """
+        with transaction.atomic():
+            if Reaction.objects.clear(self, user, kind) is not None:
+                self._count_reaction_change(kind, None)
+                return None
+            self.set_reaction(user, kind)
+        return kind
+
+    def add_favorite(self, user):
+        """
+        Add the article to the user's favorites
+        :return: True if it was added, False if it already was a favorite
+        :rtype: bool
+        """
+        through = Article.favorited.through
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {through._meta.db_table} (article_id, user_id) '
+                f'VALUES (%s, %s) ON CONFLICT DO NOTHING',
+                [self.pk, user.pk])
+            added = cursor.rowcount
+            self._shift_counters(favorites_count=added)
+        return bool(added)
+
+    def remove_favorite(self, user):
+        """
+        Remove the article from the user's favorites
+        :return: True if it was removed, False if it was not a favorite
+        :rtype: bool
+        """
+        through = Article.favorited.through
+        with transaction.atomic():
+            removed, _ = through.objects.filter(
+                article=self, user=user).delete()
+            self._shift_counters(favorites_count=-removed)
+        return bool(removed)
+
     class Meta:
         ordering = ('title',)
+        indexes = [
+            GinIndex(fields=['search_vector'],
+                     name='article_search_vector_idx'),
+            GinIndex(fields=['tagList'], name='article_taglist_idx'),
+            # key of the cursor pagination of the articles list
+            models.Index(fields=['createdAt', 'id'],
+                         name='article_created_id_idx'),
+            # finds the articles with new activity for the trending scores
+            models.Index(fields=['reactedAt'], name='article_reactedat_idx'),
+        ]
+
+
+class TimelineManager(models.Manager):
+    """
+    Maintains and reads the feeds of followed authors' articles. Articles
+    are copied into the followers' timelines when they are published, apart
+    from those of authors with more than `FEED_FANOUT_LIMIT` followers which
+    are read from the articles table when the feed is requested.
+    """
+
+    def can_fan_out(self, author):
+        """
+        :return: whether the author's new articles are copied into the
+        timelines of their followers
+        :rtype: bool
+        """
+        limit = settings.FEED_FANOUT_LIMIT
+        return author.followers.all()[:limit + 1].count() <= limit
+
+    def fan_out(self, article):
+        """
+        Add the article to the timelines of its author's followers
+        """
+        follows = User.follows.through._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.model._meta.db_table} '
+                f'(user_id, article_id, author_id, "createdAt") '
+                f'SELECT from_user_id, %s, %s, %s FROM {follows} '
+                f'WHERE to_user_id = %s ON CONFLICT DO NOTHING',
+                [article.pk, article.author_id, article.createdAt,
+                 article.author_id])
+
+    def follow(self, user, author):
+        """
+        Add the articles the author has already published to the timeline of
+        their new follower
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.model._meta.db_table} '
+                f'(user_id, article_id, author_id, "createdAt") '
+                f'SELECT %s, id, author, "createdAt" '
+                f'FROM {Article._meta.db_table} '
+                f'WHERE author = %s AND fanned_out ON CONFLICT DO NOTHING',
+                [user.pk, author.pk])
+
+    def unfollow(self, user, author):
+        """
+        Remove the author's articles from the timeline of a former follower
+        """
+        self.filter(user=user, author=author).delete()
+
+    def page(self, user, position, size):
+        """
+        Find a page of the user's feed, newest first.
+        :param position: the (createdAt, id) key of the article the page
+        starts after, None for the first page
+        :return: the ids of the articles on the page
+        :rtype: list
+        """
+        followed = User.follows.through.objects.filter(from_user=user) \
+            .values('to_user')
+        pushed = self.filter(user=user)
+        pulled = Article.objects.filter(author__in=followed, fanned_out=False)
+        if position is not None:
+            created, pk = position
+            pushed = pushed.filter(createdAt__lte=created).filter(
+                models.Q(createdAt__lt=created) | models.Q(article_id__lt=pk))
+            pulled = pulled.filter(createdAt__lte=created).filter(
+                models.Q(createdAt__lt=created) | models.Q(id__lt=pk))
+
+        # both are range scans of an index in the order of the feed
+        keys = list(pushed.order_by('-createdAt', '-article_id')
+                    .values_list('createdAt', 'article_id')[:size])
+        keys += pulled.order_by('-createdAt', '-id') \
+            .values_list('createdAt', 'id')[:size]
+        keys.sort(reverse=True)
+        return [pk for _, pk in keys[:size]]
+
+
+class TimelineEntry(models.Model):
+    """
+    An article in the feed of one of its author's followers
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='timeline')
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='+')
+    # the author and creation date are copied from the article, so that the
+    # timeline can be read and pruned without joining the articles
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='+')
+    createdAt = models.DateTimeField()
+
+    objects = TimelineManager()
+
+    def __str__(self):
+        return f'TimelineEntry: <{self.user_id} {self.article_id}>'
+
+    class Meta:
+        unique_together = ('user', 'article')
+        indexes = [
+            # key of the cursor pagination of the feed
+            models.Index(fields=['user', 'createdAt', 'article'],
+                         name='timeline_user_created_idx'),
+        ]
+
+
+class ArticleBodyManager(models.Manager):
+
+    def store(self, article, text):
+        """
+        Save the body of the article, inserting or replacing it in one
+        statement
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.model._meta.db_table} (article_id, text) '
+                f'VALUES (%s, %s) ON CONFLICT (article_id) DO UPDATE '
+                f'SET text = EXCLUDED.text', [article.pk, text])
+        # the article's cached body is now the saved one
+        article.content = self.model(article=article, text=text)
+
+
+class ArticleBody(models.Model):
+    """
+    The body of an article. It is kept apart from the other columns of the
+    article so that the rows read by lists, filters and counts stay narrow,
+    and is only loaded where the full article is shown or edited. Long
+    bodies are compressed by PostgreSQL when they are stored.
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   primary_key=True, related_name='content')
+    text = models.TextField()
+
+    objects = ArticleBodyManager()
+
+    def __str__(self):
+        return f'ArticleBody: <{self.article_id}>'
+
+
+class ReactionManager(models.Manager):
+    """
+    Changes the reactions with single statements, so that concurrent
+    requests cannot leave a user with two reactions or count one twice
+    """
+
+    def set_state(self, article, user, kind):
+        """
+        Insert the user's reaction, or switch its kind if it is different.
+        :return: the user's previous reaction
+        :rtype: str or None
+        """
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            # `xmax` is 0 for a freshly inserted row. Nothing is returned
+            # when the reaction already had this kind.
+            cursor.execute(
+                f'INSERT INTO {table} '
+                f'(user_id, article_id, kind, "createdAt") '
+                f'VALUES (%s, %s, %s, %s) '
+                f'ON CONFLICT (user_id, article_id) DO UPDATE '
+                f'SET kind = EXCLUDED.kind, '
+                f'"createdAt" = EXCLUDED."createdAt" '
+                f'WHERE {table}.kind <> EXCLUDED.kind '
+                f'RETURNING xmax = 0',
+                [user.pk, article.pk, kind, timezone.now()])
+            row = cursor.fetchone()
+        if row is None:
+            return kind
+        if row[0]:
+            return None
+        # there are only two kinds, so the reaction was the other one
+        return Reaction.DISLIKE if kind == Reaction.LIKE else Reaction.LIKE
+
+    def clear(self, article, user, kind=None):
+        """
+        Delete the user's reaction, only if it is of `kind` when given.
+        :return: the kind of the deleted reaction, None if there was none
+        :rtype: str or None
+        """
+        table = self.model._meta.db_table
+        sql = f'DELETE FROM {table} WHERE user_id = %s AND article_id = %s'
+        params = [user.pk, article.pk]
+        if kind is not None:
+            sql += ' AND kind = %s'
+            params.append(kind)
+        with connection.cursor() as cursor:
+            cursor.execute(sql + ' RETURNING kind', params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def viewer_states(self, user, article_ids):
+        """
+        Find out which of the articles the user likes, dislikes and has
+        favorited, with one query over the reactions and favorites tables.
+        :return: the `liked`, `disliked` and `favorited` flags of every
+        article by its id
+        :rtype: dict
+        """
+        states = {pk: {'liked': False, 'disliked': False, 'favorited': False}
+                  for pk in article_ids}
+        if not states or not user.is_authenticated:
+            return states
+
+        reactions = self.filter(user=user, article_id__in=states) \
+            .values_list('article_id', 'kind')
+        favorites = Article.favorited.through.objects \
+            .filter(user=user, article_id__in=states) \
+            .annotate(kind=Value('favorite', output_field=CharField())) \
+            .values_list('article_id', 'kind')
+        flags = {
+            Reaction.LIKE: 'liked',
+            Reaction.DISLIKE: 'disliked',
+            'favorite': 'favorited',
+        }
+        for pk, kind in reactions.union(favorites, all=True):
+            states[pk][flags[kind]] = True
+        return states
+
+
+class Reaction(models.Model):
+    """
+    A user's like or dislike of an article. A user has at most one reaction
+    per article, so liking and disliking exclude each other.
+    """
+    LIKE = 'like'
+    DISLIKE = 'dislike'
+    KINDS = (
+        (LIKE, 'Like'),
+        (DISLIKE, 'Dislike'),
+    )
+    # the article counter each kind of reaction is counted in
+    COUNTERS = {
+        LIKE: 'likes_count',
+        DISLIKE: 'dislikes_count',
+    }
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='article_reactions')
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='reactions')
+    kind = models.CharField(max_length=7, choices=KINDS)
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    objects = ReactionManager()
+
+    def __str__(self):
+        return f'Reaction: <{self.user_id} {self.kind}s {self.article_id}>'
+
+    class Meta:
+        unique_together = ('user', 'article')
+
+
+class SlugHistoryManager(models.Manager):
+
+    def record(self, article, old_slug):
+        """
+        Remember that the article was reachable at `old_slug` before its slug
+        was changed
+        """
+        self.update_or_create(slug=old_slug, defaults={'article': article})
+        # the article may have been given back one of its previous slugs
+        self.filter(slug=article.slug).delete()
+
+    def current_slug(self, old_slug):
+        """
+        :return: the slug the article formerly at `old_slug` is now at, None
+        if no article ever had it
+        :rtype: str or None
+        """
+        return self.filter(slug=old_slug) \
+            .values_list('article__slug', flat=True).first()
+
+
+class SlugHistory(models.Model):
+    """
+    A slug an article had before its title was edited, so that links to the
+    article keep working after the edit
+    """
+    slug = models.CharField(max_length=200, unique=True)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='slug_history')
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    objects = SlugHistoryManager()
+
+    def __str__(self):
+        return f'SlugHistory: <{self.slug}>'
+
+
+class TrendingScoreManager(models.Manager):
+
+    def refresh(self, full=False):
+        """
+        Store the trending scores of the articles with activity since the
+        previous refresh, or of all the articles on the first refresh or
+        when `full` is set.
+        :return: the number of scores stored
+        :rtype: int
+        """
+        started = timezone.now()
+        articles = Article.objects.all()
+        since = None if full else \
+            self.aggregate(since=Max('computedAt'))['since']
+        if since is not None:
+            # new and deleted comments move `reactedAt` too
+            articles = articles.filter(
+                Q(createdAt__gte=since) | Q(reactedAt__gte=since))
+
+        sql, params = articles.order_by() \
+            .annotate(points=trending_points()) \
+            .values_list('pk', 'points', 'createdAt').query.sql_with_params()
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            # the order of magnitude of the points, plus a base growing with
+            # the publication date
+            cursor.execute(
+                f'INSERT INTO {table} (article_id, score, "computedAt") '
+                f'SELECT id, SIGN(points) * LOG(GREATEST(ABS(points), 1)) '
+                f'+ EXTRACT(EPOCH FROM "createdAt") / %s, %s '
+                f'FROM ({sql}) activity '
+                f'ON CONFLICT (article_id) DO UPDATE '
+                f'SET score = EXCLUDED.score, '
+                f'"computedAt" = EXCLUDED."computedAt"',
+                (TRENDING_TIMESCALE, started) + tuple(params))
+            return cursor.rowcount
+
+
+class TrendingScore(models.Model):
+    """
+    The precomputed trending score of an article, refreshed by the
+    `refresh_trending` command. Instead of decaying the scores of older
+    articles as time passes, newer articles start from a higher base, so
+    a score only changes when there is activity on its article while the
+    ranking is the same as with decayed scores.
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   primary_key=True, related_name='trending')
+    score = models.FloatField()
+    # when the refresh that computed the score started
+    computedAt = models.DateTimeField()
+
+    objects = TrendingScoreManager()
+
+    def __str__(self):
+        return f'TrendingScore: <{self.article_id} {self.score}>'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score_idx'),
+        ]
@@ -0,0 +1,181 @@
+import base64
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, \
+    LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import TimelineEntry
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward only cursor pagination keyed on the indexed (createdAt, id) pair,
+    newest first. The cursor holds the key of the last article of the page,
+    so every page is an index range scan no matter how deep it is, rows
+    inserted in the meantime cannot shift the pages and no count is run.
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        # fetching one extra row tells whether there is a next page
+        results = self.fetch(queryset, position, self.page_size + 1)
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def fetch(self, queryset, position, size):
+        """
+        :return: the `size` articles following the `position` key
+        :rtype: list
+        """
+        queryset = queryset.order_by('-createdAt', '-id')
+        if position is not None:
+            created, pk = position
+            # the `lte` bound lets the index range scan start at the cursor
+            queryset = queryset.filter(createdAt__lte=created).filter(
+                Q(createdAt__lt=created) | Q(id__lt=pk))
+        return list(queryset[:size])
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        """
+        :return: None on the first page, else the (createdAt, id) key the
+        next page starts after
+        :rtype: tuple or None
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created, pk = base64.urlsafe_b64decode(
+                encoded.encode('ascii')).decode('ascii').split('|')
+            created, pk = parse_datetime(created), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created, pk
+
+    @staticmethod
+    def encode_cursor(article):
+        key = f'{article.createdAt.isoformat()}|{article.pk}'
+        return base64.urlsafe_b64encode(key.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(),
+                                   self.cursor_query_param,
+                                   self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, \
+            'coreapi must be installed to use `get_schema_fields()`'
+        assert coreschema is not None, \
+            'coreschema must be installed to use `get_schema_fields()`'
+        return [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Cursor',
+                    description='The pagination cursor value.')),
+            coreapi.Field(
+                name=self.page_size_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.Integer(
+                    title='Page size',
+                    description='Number of results to return per page.')),
+        ]
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Pages the requesting user's feed with the same cursors as the articles
+    list. The page is found in the user's timeline, then the articles on it
+    are loaded from the queryset.
+    """
+
+    def fetch(self, queryset, position, size):
+        ids = TimelineEntry.objects.page(self.request.user, position, size)
+        articles = queryset.in_bulk(ids)
+        return [articles[pk] for pk in ids if pk in articles]
+
+
+class ArticleLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = 20
+
+
+class ArticlePagination(BasePagination):
+    """
+    Paginates articles with `KeysetPagination` unless the client asks for
+    `limit`/`offset` pages, or the results are ordered by a filter (such as
+    search relevance) rather than by creation date.
+    """
+
+    def __init__(self):
+        self.keyset = KeysetPagination()
+        self.limit_offset = ArticleLimitOffsetPagination()
+        self.paginator = self.keyset
+
+    def use_limit_offset(self, queryset, request):
+        params = request.query_params
+        return (self.limit_offset.limit_query_param in params or
+                self.limit_offset.offset_query_param in params or
+                bool(queryset.query.order_by))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_limit_offset(queryset, request):
+            self.paginator = self.limit_offset
+        else:
+            self.paginator = self.keyset
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_schema_fields(self, view):
+        return (self.keyset.get_schema_fields(view) +
+                self.limit_offset.get_schema_fields(view))
+
+
+class FavoritersPagination(CursorPagination):
+    """
+    Pages the users who favorited an article, most recent first. The join
+    table's own id is unique and indexed along with the article, so the
+    cursor only needs that one column.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    ordering = '-id'
@@ -1,7 +1,20 @@
+from django.db.models import Avg
 from rest_framework import serializers
 
-from .models import Article
-from ..authentication.serializers import UserSerializer
+from .models import Article, Reaction
+from ..profiles.serializers import AuthorSerializer
+
+
+class ArticleListSerializer(serializers.ListSerializer):
+    """
+    Serializes a page of articles, looking up the viewer's reactions to all
+    of them at once
+    """
+
+    def to_representation(self, data):
+        articles = list(data.all() if hasattr(data, 'all') else data)
+        self.child.load_viewer_states(articles)
+        return super(ArticleListSerializer, self).to_representation(articles)
 
 
 class ArticleSerializer(serializers.ModelSerializer):
@@ -9,16 +22,145 @@ class ArticleSerializer(serializers.ModelSerializer):
     #     required=True,
     #     max_length=100,
     # )
-    author = UserSerializer(read_only=True)
+    author = AuthorSerializer(read_only=True)
+
+    # kept in the article's `ArticleBody`, lists leave it out
+    body = serializers.CharField()
+
+    # the reaction counts are read from the counters stored on the article
+    likes = serializers.IntegerField(source='likes_count', read_only=True)
+    dislikes = serializers.IntegerField(source='dislikes_count',
+                                        read_only=True)
+    favoritesCount = serializers.IntegerField(source='favorites_count',
+                                              read_only=True)
+    commentsCount = serializers.IntegerField(source='comments_count',
+                                             read_only=True)
+
+    # worked out from the body when the article is saved
+    wordCount = serializers.IntegerField(source='word_count', read_only=True)
+    readingTimeMinutes = serializers.IntegerField(
+        source='reading_time_minutes', read_only=True)
+    excerpt = serializers.CharField(read_only=True)
 
-    likes = serializers.SerializerMethodField(method_name='get_likes_count')
-    dislikes = serializers.SerializerMethodField(
-        method_name='get_dislikes_count')
+    # Whether the requesting user likes, dislikes or has favorited the
+    # article, only shown to authenticated users
+    liked = serializers.SerializerMethodField()
+    disliked = serializers.SerializerMethodField()
+    favorited = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
-        fields = '__all__'
+        exclude = ('likes_count', 'dislikes_count', 'favorites_count',
+                   'comments_count', 'search_vector', 'reactedAt',
+                   'fanned_out', 'word_count', 'reading_time_minutes')
         lookup_url_kwarg = 'slug'
+        list_serializer_class = ArticleListSerializer
+
+    VIEWER_FIELDS = ('liked', 'disliked', 'favorited')
+
+    # The compact representation used by feeds
+    SUMMARY_FIELDS = ('id', 'slug', 'title', 'description', 'tagList',
+                      'createdAt', 'author', 'likes', 'dislikes',
+                      'favoritesCount', 'commentsCount', 'averageRating',
+                      'ratingsCount', 'excerpt', 'readingTimeMinutes',
+                      'wordCount') + \
+        VIEWER_FIELDS
+
+    # The model columns read by the fields that are not named after one.
+    # The ratings come from `with_stats` and the viewer's state from the
+    # reactions and favorites tables
+    FIELD_COLUMNS = {
+        'likes': ('likes_count',),
+        'dislikes': ('dislikes_count',),
+        'body': ('content__text',),
+        'favoritesCount': ('favorites_count',),
+        'commentsCount': ('comments_count',),
+        'wordCount': ('word_count',),
+        'readingTimeMinutes': ('reading_time_minutes',),
+        'averageRating': (),
+        'ratingsCount': (),
+        'liked': (),
+        'disliked': (),
+        'favorited': (),
+    }
+
+    def __init__(self, *args, **kwargs):
+        """
+        Takes an optional `fields` argument restricting the representation
+        to these fields
+        """
+        fields = kwargs.pop('fields', None)
+        super(ArticleSerializer, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if self.viewer is None:
+            for name in self.VIEWER_FIELDS:
+                self.fields.pop(name, None)
+
+    @property
+    def viewer(self):
+        """
+        The authenticated user the articles are serialized for, if any
+        """
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
+
+    def load_viewer_states(self, articles):
+        """
+        Look up the viewer's reactions to all these articles in one query,
+        rather than one query per article
+        """
+        if self.viewer is None or not \
+                set(self.VIEWER_FIELDS) & set(self.fields):
+            return
+        states = self.context.setdefault('viewer_states', {})
+        states.update(Reaction.objects.viewer_states(
+            self.viewer, [article.pk for article in articles
+                          if article.pk not in states]))
+
+    def viewer_state(self, article, flag):
+        states = self.context.get('viewer_states', {})
+        if article.pk not in states:
+            self.load_viewer_states([article])
+            states = self.context['viewer_states']
+        return states[article.pk][flag]
+
+    def get_liked(self, article):
+        return self.viewer_state(article, 'liked')
+
+    def get_disliked(self, article):
+        return self.viewer_state(article, 'disliked')
+
+    def get_favorited(self, article):
+        return self.viewer_state(article, 'favorited')
+
+    @classmethod
+    def list_fields(cls):
+        """
+        :return: the fields of the articles in lists, all but the body
+        :rtype: tuple
+        """
+        return tuple(name for name in cls().fields if name != 'body') + \
+            cls.VIEWER_FIELDS
+
+    @classmethod
+    def columns(cls, fields):
+        """
+        :return: the names of the model columns the fields are read from
+        :rtype: set
+        """
+        columns = set()
+        for name in fields:
+            columns.update(cls.FIELD_COLUMNS.get(name, (name,)))
+        if 'author' in columns:
+            # the author is loaded in the same query by `select_related`
+            columns.update(f'author__{field}'
+                           for field in AuthorSerializer.Meta.fields)
+        return columns
 
     def create(self, validated_data):
         author = self.context['request'].user
@@ -36,25 +178,22 @@ class ArticleSerializer(serializers.ModelSerializer):
     def get_averageRating(article):
         """
         Calculates weighted average rating.
+        Articles fetched through `Article.objects.with_stats()` already carry
+        the average, otherwise it is aggregated in a single query.
         :param article: The article whose ratings we are calculating
         :return: None if no one has rated, The weighted average to 2 decimal
         places
         :rtype: float or None
         """
-        all_ratings = article.ratings.all().count()
-        fives = article.ratings.filter(stars=5).count()
-        fours = article.ratings.filter(stars=4).count()
-        threes = article.ratings.filter(stars=3).count()
-        twos = article.ratings.filter(stars=2).count()
-        ones = article.ratings.filter(stars=1).count()
-
-        if all_ratings < 1:
-            return None
+        if hasattr(article, 'average_rating'):
+            weighted_average = article.average_rating
         else:
-            weighted_total = (5 * fives) + (4 * fours) + (3 * threes) + (
-                    2 * twos) + (1 * ones)
-            weighted_average = weighted_total / all_ratings
-            return round(weighted_average, 2)
+            weighted_average = article.ratings.aggregate(
+                average=Avg('stars'))['average']
+
+        if weighted_average is None:
+            return None
+        return round(float(weighted_average), 2)
 
     @staticmethod
     def get_ratingsCount(article):
@@ -64,24 +203,23 @@ class ArticleSerializer(serializers.ModelSerializer):
         :return:
         :rtype: int
         """
-        return article.ratings.all().count()
+        if hasattr(article, 'ratings_total'):
+            return article.ratings_total
+        return article.ratings.count()
 
-    def get_likes_count(self, instance):
-        """
-        Gets the total number of likes for a particular article
-        """
-        return instance.likes.count()
 
-    def get_dislikes_count(self, instance):
-        """
-        Gets the total number of dislikes for a particular article
-        """
-        return instance.dislikes.count()
+class ReactionSerializer(serializers.Serializer):
+    """Validates the reaction a user sets on an article"""
+    reaction = serializers.ChoiceField(choices=Reaction.KINDS,
+                                       allow_null=True)
 
-    @staticmethod
-    def get_favorite_count(instance):
-        """
-        Gets the number of times that a particular article has been
-        favourited
-        """
-        return instance.favorited.count()
+
+class FavoriterSerializer(serializers.ModelSerializer):
+    """A user who favorited an article, read from the favorites table"""
+    username = serializers.ReadOnlyField(source='user.username')
+    bio = serializers.ReadOnlyField(source='user.bio')
+    image = serializers.ReadOnlyField(source='user.image')
+
+    class Meta:
+        model = Article.favorited.through
+        fields = ('username', 'bio', 'image')
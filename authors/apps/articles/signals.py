@@ -0,0 +1,27 @@
+"""
+Keep the cached articles in step with their authors, whose username, bio
+and image are embedded in the representation of every article they wrote.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_article, is_enabled
+from .models import Article
+from ..authentication.models import User
+from ..profiles.serializers import AuthorSerializer
+
+
+@receiver(post_save, sender=User)
+def invalidate_authored_articles(sender, instance, created, raw=False,
+                                 update_fields=None, **kwargs):
+    if created or raw or not is_enabled():
+        return
+    # saves of other fields, such as the last login, leave the articles as
+    # they are
+    if update_fields is not None and \
+            not set(update_fields) & set(AuthorSerializer.Meta.fields):
+        return
+    slugs = Article.objects.filter(author=instance) \
+        .values_list('slug', flat=True)
+    if slugs:
+        invalidate_article(*slugs)
@@ -0,0 +1,173 @@
+import warnings
+
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from authors.apps.articles.cache import _version_key
+from authors.apps.articles.models import Article
+from authors.apps.articles.views import ArticleDetail, LikeArticle
+from authors.apps.authentication.models import User
+
+
+@override_settings(ARTICLE_CACHE_ENABLED=True)
+class ArticleCacheTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        cache.clear()
+        self.request_factory = APIRequestFactory()
+        self.user = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.article = Article.objects.create(
+            title="Be a python coder in three weeks without a hassle",
+            description="Are you ready?",
+            body="It takes grit",
+            author=self.user,
+            slug="be-a-python-coder",
+            tagList=["javascript", "python"],
+            images=["image1", "image2"]
+        )
+        self.url = reverse('articles:article_detail',
+                           kwargs={"slug": self.article.slug})
+
+    def get_article(self):
+        request = self.request_factory.get(self.url)
+        return ArticleDetail.as_view()(request, slug=self.article.slug)
+
+    def test_second_read_is_a_hit(self):
+        """
+        Test that the article is served from the cache after the first read
+        """
+        response = self.get_article()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.get_article()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['title'], self.article.title)
+
+    def test_edit_invalidates(self):
+        """
+        Test that editing the article invalidates its cached response
+        """
+        self.get_article()
+        self.article.body = "It takes a lot of grit"
+        self.article.save()
+        response = self.get_article()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['body'], "It takes a lot of grit")
+
+    def test_like_invalidates(self):
+        """
+        Test that liking the article invalidates its cached response
+        """
+        self.get_article()
+        url = reverse('articles:like_article',
+                      kwargs={"slug": self.article.slug})
+        request = self.request_factory.put(url)
+        force_authenticate(request, user=self.user)
+        LikeArticle.as_view()(request, slug=self.article.slug)
+        response = self.get_article()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['likes'], 1)
+
+    def test_cached_article_shows_viewer_state(self):
+        """
+        Test that the cached article is shared by all users while each of
+        them sees their own reactions
+        """
+        reader = User.objects.create(
+            username='dennis', email='dennis@gmail.com', password='1232444nm')
+        self.article.add_favorite(reader)
+
+        request = self.request_factory.get(self.url)
+        force_authenticate(request, user=reader)
+        response = ArticleDetail.as_view()(request, slug=self.article.slug)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.data['favorited'])
+
+        request = self.request_factory.get(self.url)
+        force_authenticate(request, user=self.user)
+        response = ArticleDetail.as_view()(request, slug=self.article.slug)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertFalse(response.data['favorited'])
+        self.assertFalse(response.data['liked'])
+
+        response = self.get_article()
+        self.assertNotIn('favorited', response.data)
+
+    def test_missing_article_not_cached(self):
+        """
+        Test that a missing article is not cached
+        """
+        self.article.delete()
+        response = self.get_article()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('X-Cache', response)
+
+    def test_unknown_slug_leaves_no_version(self):
+        """
+        Test that requesting an article that does not exist does not start
+        a version for its slug in the cache
+        """
+        request = self.request_factory.get(self.url)
+        response = ArticleDetail.as_view()(request, slug='no-such-article')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(cache.get(_version_key('no-such-article')))
+
+    def test_cache_keys_valid_for_any_slug(self):
+        """
+        Test that slugs memcached would not accept in a key, too long or
+        with spaces, are cached under valid keys
+        """
+        self.article.slug = 'a python coder ' * 13
+        self.article.save()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', CacheKeyWarning)
+            for _ in range(2):
+                request = self.request_factory.get(self.url)
+                response = ArticleDetail.as_view()(
+                    request, slug=self.article.slug)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertFalse([warning for warning in caught
+                          if warning.category is CacheKeyWarning])
+
+    def test_profile_edit_invalidates(self):
+        """
+        Test that editing the author's profile invalidates the cached
+        articles embedding it
+        """
+        self.get_article()
+        self.user.bio = "Pythonista"
+        self.user.save()
+        response = self.get_article()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['author']['bio'], "Pythonista")
+
+    def test_last_login_keeps_cache(self):
+        """
+        Test that saving fields of the author that articles do not show
+        keeps the cached articles
+        """
+        self.get_article()
+        self.user.save(update_fields=['last_login'])
+        response = self.get_article()
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_not_cached_without_shared_cache(self):
+        """
+        Test that the article is read from the database every time when the
+        cache is not shared by all the processes
+        """
+        with override_settings(ARTICLE_CACHE_ENABLED=False):
+            cache.clear()
+            self.get_article()
+            response = self.get_article()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', response)
+        self.assertIsNone(cache.get(_version_key(self.article.slug)))
@@ -0,0 +1,111 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+
+from authors.apps.articles.models import Article, Reaction
+from authors.apps.articles.views import ArticleDetail, ArticleList
+from authors.apps.authentication.models import User
+
+
+@override_settings(ARTICLE_CACHE_ENABLED=True)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        cache.clear()
+        self.request_factory = APIRequestFactory()
+        self.user = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.reader = User.objects.create(
+            username='kevin', email='kevin@gmail.com', password='1232444nm')
+        self.article = Article.objects.create(
+            title="Be a python coder in three weeks without a hassle",
+            description="Are you ready?",
+            body="It takes grit",
+            author=self.user,
+            slug="be-a-python-coder",
+            tagList=["javascript", "python"],
+            images=["image1", "image2"]
+        )
+        self.detail_url = reverse('articles:article_detail',
+                                  kwargs={"slug": self.article.slug})
+        self.articles_url = reverse('articles:all_articles')
+
+    def get_article(self, **headers):
+        request = self.request_factory.get(self.detail_url, **headers)
+        return ArticleDetail.as_view()(request, slug=self.article.slug)
+
+    def get_articles(self, **headers):
+        request = self.request_factory.get(self.articles_url, **headers)
+        return ArticleList.as_view()(request)
+
+    def test_detail_not_modified(self):
+        """
+        Test that a client sending the current ETag gets a 304, on both a
+        cache miss and a cache hit
+        """
+        etag = self.get_article()['ETag']
+        cache.clear()
+        response = self.get_article(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.get_article()
+        response = self.get_article(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_detail_modified_by_reaction(self):
+        """
+        Test that a reaction changes the article's ETag
+        """
+        response = self.get_article()
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        self.article.set_reaction(self.reader, Reaction.LIKE)
+        response = self.get_article(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_modified_by_author_edit(self):
+        """
+        Test that editing the author embedded in the article changes the
+        article's ETag, without a cache to invalidate
+        """
+        with override_settings(ARTICLE_CACHE_ENABLED=False):
+            etag = self.get_article()['ETag']
+            self.user.bio = "Pythonista"
+            self.user.save()
+            response = self.get_article(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['author']['bio'], "Pythonista")
+
+    def test_list_not_modified(self):
+        """
+        Test that the articles list answers 304 until an article changes
+        """
+        etag = self.get_articles()['ETag']
+        # the validators are read from the cache, not from the articles
+        with self.assertNumQueries(0):
+            response = self.get_articles(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.article.add_favorite(self.reader)
+        response = self.get_articles(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        self.article.delete()
+        response = self.get_articles(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_without_shared_cache(self):
+        """
+        Test that the lists have no validators when the cache holding their
+        version is not shared by all the processes
+        """
+        with override_settings(ARTICLE_CACHE_ENABLED=False):
+            response = self.get_articles()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
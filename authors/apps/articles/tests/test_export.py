@@ -0,0 +1,83 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.views import ArticleExport
+from authors.apps.authentication.models import User
+
+
+class ArticleExportTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.request_factory = APIRequestFactory()
+        self.url = reverse('articles:article_export')
+        self.admin = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm',
+            is_staff=True)
+        for number in range(3):
+            Article.objects.create(
+                title=f"Article {number}", description="Are you ready?",
+                body="It takes,\n\"grit\"", author=self.admin,
+                slug=f"article-{number}", tagList=["python"])
+
+    def export(self, query, user=None):
+        request = self.request_factory.get(self.url + query)
+        force_authenticate(request, user=user or self.admin)
+        return ArticleExport.as_view()(request)
+
+    def test_ndjson_export(self):
+        """
+        Test that the articles are streamed a JSON object per line
+        """
+        response = self.export('?include=author,counts')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        articles = [json.loads(line) for line in lines]
+        self.assertEqual([article['slug'] for article in articles],
+                         ['article-0', 'article-1', 'article-2'])
+        self.assertEqual(articles[0]['author'], 'olivia')
+        self.assertEqual(articles[0]['likesCount'], 0)
+        self.assertEqual(articles[0]['commentsCount'], 0)
+        self.assertNotIn('tagList', articles[0])
+
+    def test_csv_export(self):
+        """
+        Test that the CSV export round-trips the body and tags
+        """
+        response = self.export('?output=csv&include=tags')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['body'], "It takes,\n\"grit\"")
+        self.assertEqual(json.loads(rows[0]['tagList']), ["python"])
+
+    def test_export_options(self):
+        """
+        Test that only staff can export and that options are validated
+        """
+        reader = User.objects.create(
+            username='dennis', email='dennis@gmail.com', password='1232444nm')
+        response = self.export('', user=reader)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.export('?output=xml&include=secrets')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('output', response.data['errors'])
+        self.assertIn('include', response.data['errors'])
+
+    def test_export_command(self):
+        """
+        Test that the command writes the export
+        """
+        output = StringIO()
+        call_command('export_articles', '--include', 'tags', stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
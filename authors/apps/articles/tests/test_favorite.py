@@ -4,7 +4,7 @@ from rest_framework.test import APITestCase, force_authenticate, \
     APIRequestFactory
 
 from authors.apps.articles.models import Article
-from authors.apps.articles.views import FavoriteArticle
+from authors.apps.articles.views import ArticleFavoriters, FavoriteArticle
 from authors.apps.authentication.models import User
 
 
@@ -75,8 +75,8 @@ class AuthenticationTests(APITestCase):
 
         response = view(request, slug)
 
-        assert (user.email in str(
-            str(response.data['article']['favoriting_users'])))
+        self.assertEqual(response.data,
+                         {"favorited": True, "favoritesCount": 1})
         self.assertEqual(response.status_code,
                          status.HTTP_200_OK)
 
@@ -86,8 +86,8 @@ class AuthenticationTests(APITestCase):
 
         self.assertEqual(response.status_code,
                          status.HTTP_200_OK)
-        assert ('favoriting_users' not in str(
-            response.data['article']))
+        self.assertEqual(response.data,
+                         {"favorited": False, "favoritesCount": 0})
 
     def test_un_favourite(self):
         user = User.objects.get(email="musamo@live.com")
@@ -117,8 +117,8 @@ class AuthenticationTests(APITestCase):
 
         self.assertEqual(response.status_code,
                          status.HTTP_200_OK)
-        assert ("You have not marked this article as a favourite" in
-                str(response.data))
+        self.assertEqual(response.data,
+                         {"favorited": False, "favoritesCount": 0})
 
         # Favourite the article
         self.favorite_url = reverse(favorite_url,
@@ -132,7 +132,38 @@ class AuthenticationTests(APITestCase):
         force_authenticate(request, user=user)
         response = view(request, slug)
 
-        assert ('favoriting_users' not in str(
-            response.data['article']))
+        self.assertEqual(response.data,
+                         {"favorited": False, "favoritesCount": 0})
         self.assertEqual(response.status_code,
                          status.HTTP_200_OK)
+
+    def test_favoriters(self):
+        user = User.objects.get(email="musamo@live.com")
+        article = Article.objects.create(
+            title=self.title, description="Are you ready?",
+            body="It takes grit", author=user, slug="be-a-python-coder")
+        for number in range(3):
+            article.add_favorite(User.objects.create(
+                username=f'reader{number}', email=f'reader{number}@live.com',
+                password='1234Pass'))
+
+        view = ArticleFavoriters.as_view()
+        url = reverse('articles:article_favoriters',
+                      kwargs={"slug": article.slug})
+        request = self.request_factory.get(url + '?page_size=2')
+        response = view(request, slug=article.slug)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [favoriter['username'] for favoriter in response.data['results']],
+            ['reader2', 'reader1'])
+
+        request = self.request_factory.get(response.data['next'])
+        response = view(request, slug=article.slug)
+        self.assertEqual(
+            [favoriter['username'] for favoriter in response.data['results']],
+            ['reader0'])
+        self.assertIsNone(response.data['next'])
+
+        request = self.request_factory.get(url)
+        response = view(request, slug='not-an-article')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
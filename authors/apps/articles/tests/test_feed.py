@@ -0,0 +1,93 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from authors.apps.articles.models import Article, TimelineEntry
+from authors.apps.articles.views import ArticleFeed
+from authors.apps.authentication.models import User
+
+
+class ArticleFeedTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.request_factory = APIRequestFactory()
+        self.feed_url = reverse('articles:article_feed')
+        self.reader = User.objects.create(
+            username='dennis', email='dennis@gmail.com', password='1232444nm')
+        self.author = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.celebrity = User.objects.create(
+            username='famous', email='famous@gmail.com', password='1232444nm')
+        self.stranger = User.objects.create(
+            username='stranger', email='stranger@gmail.com',
+            password='1232444nm')
+        self.reader.follows.add(self.author, self.celebrity)
+
+    def publish(self, author, number):
+        return Article.objects.create(
+            title=f"Article {number}", description="Are you ready?",
+            body="It takes grit", author=author, slug=f"article-{number}")
+
+    def get_feed(self, url=None):
+        request = self.request_factory.get(url or self.feed_url)
+        force_authenticate(request, user=self.reader)
+        response = ArticleFeed.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_feed_has_followed_authors_only(self):
+        """
+        Test that the feed lists the followed authors' articles newest first,
+        whether or not they were copied into the timeline
+        """
+        with override_settings(FEED_FANOUT_LIMIT=0):
+            famous = self.publish(self.celebrity, 0)
+        self.publish(self.author, 1)
+        self.publish(self.stranger, 2)
+        self.publish(self.author, 3)
+
+        self.assertFalse(famous.fanned_out)
+        self.assertEqual(TimelineEntry.objects.filter(
+            user=self.reader).count(), 2)
+        response = self.get_feed()
+        self.assertEqual(
+            [article['slug'] for article in response.data['results']],
+            ['article-3', 'article-1', 'article-0'])
+
+    def test_feed_cursor_pagination(self):
+        """
+        Test that the feed is paged with cursors across both sources
+        """
+        for number in range(3):
+            with override_settings(FEED_FANOUT_LIMIT=number % 2):
+                self.publish(self.celebrity, number)
+
+        response = self.get_feed(self.feed_url + '?page_size=2')
+        self.assertEqual(
+            [article['slug'] for article in response.data['results']],
+            ['article-2', 'article-1'])
+        response = self.get_feed(response.data['next'])
+        self.assertEqual(
+            [article['slug'] for article in response.data['results']],
+            ['article-0'])
+        self.assertIsNone(response.data['next'])
+
+    def test_follow_and_unfollow(self):
+        """
+        Test that following an author brings their articles into the feed
+        and unfollowing removes them
+        """
+        self.publish(self.stranger, 0)
+        self.reader.follows.add(self.stranger)
+        TimelineEntry.objects.follow(self.reader, self.stranger)
+        response = self.get_feed()
+        self.assertEqual(len(response.data['results']), 1)
+
+        self.reader.follows.remove(self.stranger)
+        TimelineEntry.objects.unfollow(self.reader, self.stranger)
+        response = self.get_feed()
+        self.assertEqual(response.data['results'], [])
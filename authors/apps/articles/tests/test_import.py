@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from authors.apps.articles.models import Article, TimelineEntry
+from authors.apps.authentication.models import User
+
+
+class ImportArticlesTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.author = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.reader = User.objects.create(
+            username='dennis', email='dennis@gmail.com', password='1232444nm')
+        self.reader.follows.add(self.author)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as source:
+            source.write(content)
+        return path
+
+    def import_articles(self, *args):
+        output = StringIO()
+        call_command('import_articles', *args, stdout=output,
+                     stderr=StringIO())
+        return output.getvalue()
+
+    def test_import_jsonl(self):
+        """
+        Test that the articles are imported with their arrays, reactions
+        and derived columns, and that importing them again creates nothing
+        """
+        records = [{
+            "title": "Be a python coder",
+            "description": "Are you ready?",
+            "body": "It takes\tgrit and \"quotes\"\nand lines",
+            "author": "olivia",
+            "tagList": ["python", "a \"quoted\" tag"],
+            "createdAt": "2016-02-18T03:22:56.637Z",
+            "favorited": ["dennis"],
+            "likes": ["dennis", "nobody"],
+        }, {
+            "title": "No author",
+            "body": "It takes grit",
+            "author": "nobody",
+        }]
+        path = self.write('articles.jsonl', '\n'.join(
+            json.dumps(record) for record in records) + '\nnot json\n')
+
+        output = self.import_articles(path)
+        self.assertIn('1 articles imported, 2 records skipped', output)
+        article = Article.objects.get()
+        self.assertEqual(article.body, records[0]['body'])
+        self.assertEqual(article.tagList, records[0]['tagList'])
+        self.assertEqual(article.createdAt.year, 2016)
+        self.assertEqual(
+            (article.likes_count, article.favorites_count), (1, 1))
+        self.assertEqual(article.word_count, 7)
+        self.assertIsNotNone(article.search_vector)
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.reader, article=article).exists())
+
+        output = self.import_articles(path)
+        self.assertIn('0 articles imported', output)
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_invalid_records_skipped(self):
+        """
+        Test that malformed records and records repeating a slug of the
+        batch are skipped without stopping the import
+        """
+        record = {"title": "Grit", "body": "It takes grit",
+                  "author": "olivia", "slug": "grit"}
+        records = [
+            record,
+            dict(record, body="It takes more grit"),
+            dict(record, slug="bad-date", createdAt="2018-13-45T00:00"),
+            dict(record, slug="bad-title", title=["Grit"]),
+            dict(record, slug="other"),
+        ]
+        path = self.write('articles.jsonl', '\n'.join(
+            json.dumps(record) for record in records))
+
+        output = self.import_articles(path)
+        self.assertIn('2 articles imported, 3 records skipped', output)
+        self.assertEqual(Article.objects.get(slug='grit').body,
+                         "It takes grit")
+
+    def test_import_csv_with_checkpoint(self):
+        """
+        Test that a CSV import resumes after the records it had imported
+        """
+        path = self.write(
+            'articles.csv',
+            'title,description,body,author,tagList\n'
+            'First,Are you ready?,It takes grit,olivia,"[""python""]"\n'
+            'Second,Are you ready?,It takes grit,olivia,\n')
+        checkpoint = os.path.join(self.directory.name, 'checkpoint')
+        with open(checkpoint, 'w') as progress:
+            progress.write('1')
+
+        self.import_articles(path, '--checkpoint', checkpoint)
+        self.assertEqual(
+            list(Article.objects.values_list('title', flat=True)),
+            ['Second'])
+        with open(checkpoint) as progress:
+            self.assertEqual(progress.read(), '2')
@@ -0,0 +1,230 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from authors.apps.articles.models import Article, Reaction
+from authors.apps.articles.serializers import ArticleSerializer
+from authors.apps.articles.views import ArticleList, ArticleDetail, \
+    LikeArticle, DislikeArticle, ArticleReaction
+from authors.apps.authentication.models import User
+from authors.apps.ratings.models import Rating
+
+
+class ArticleStatsTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.request_factory = APIRequestFactory()
+        self.articles_url = reverse('articles:all_articles')
+        self.author = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.reader = User.objects.create(
+            username='kevin', email='kevin@gmail.com', password='1232444nm')
+        self.article = Article.objects.create(
+            title="Be a python coder in three weeks without a hassle",
+            description="Are you ready?",
+            body="It takes grit",
+            author=self.author,
+            slug="be-a-python-coder",
+            tagList=["javascript", "python"],
+            images=["image1", "image2"]
+        )
+        self.article.set_reaction(self.reader, Reaction.LIKE)
+        self.article.add_favorite(self.reader)
+        self.article.add_favorite(self.author)
+        Rating.objects.create(user=self.reader, article=self.article,
+                              stars=4)
+        Rating.objects.create(user=self.author, article=self.article,
+                              stars=3)
+
+    def test_annotated_stats_match_fallback(self):
+        """
+        Test that the annotated queryset and a plain instance serialize to
+        the same counts and averages
+        """
+        annotated = Article.objects.with_stats().get(pk=self.article.pk)
+        plain = Article.objects.get(pk=self.article.pk)
+        for article in (annotated, plain):
+            data = ArticleSerializer(article).data
+            self.assertEqual(data['likes'], 1)
+            self.assertEqual(data['dislikes'], 0)
+            self.assertEqual(data['favoritesCount'], 2)
+            self.assertEqual(data['ratingsCount'], 2)
+            self.assertEqual(data['averageRating'], 3.5)
+
+    def test_list_reads_annotations(self):
+        """
+        Test that the list endpoint returns the aggregated values
+        """
+        request = self.request_factory.get(self.articles_url)
+        force_authenticate(request, user=self.reader)
+        response = ArticleList.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['averageRating'], 3.5)
+        self.assertEqual(response.data['results'][0]['likes'], 1)
+
+    def test_detail_without_ratings(self):
+        """
+        Test that an article nobody has rated has no average
+        """
+        Rating.objects.all().delete()
+        url = reverse('articles:article_detail',
+                      kwargs={"slug": self.article.slug})
+        request = self.request_factory.get(url)
+        response = ArticleDetail.as_view()(request, slug=self.article.slug)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['averageRating'])
+        self.assertEqual(response.data['ratingsCount'], 0)
+
+    def test_toggles_maintain_counters(self):
+        """
+        Test that liking and disliking keep the stored counters in step
+        """
+        url = reverse('articles:like_article',
+                      kwargs={"slug": self.article.slug})
+        request = self.request_factory.put(url)
+        force_authenticate(request, user=self.author)
+        LikeArticle.as_view()(request, slug=self.article.slug)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 2)
+
+        url = reverse('articles:dislike_article',
+                      kwargs={"slug": self.article.slug})
+        request = self.request_factory.put(url)
+        force_authenticate(request, user=self.author)
+        DislikeArticle.as_view()(request, slug=self.article.slug)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.dislikes_count, 1)
+
+    def set_reaction(self, reaction):
+        url = reverse('articles:article_reaction',
+                      kwargs={"slug": self.article.slug})
+        request = self.request_factory.put(url, {"reaction": reaction},
+                                           format='json')
+        force_authenticate(request, user=self.reader)
+        return ArticleReaction.as_view()(request, slug=self.article.slug)
+
+    def test_set_reaction_is_idempotent(self):
+        """
+        Test that setting the same reaction twice counts it once and that
+        a dislike replaces the user's like
+        """
+        response = self.set_reaction('like')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likes'], 1)
+
+        response = self.set_reaction('dislike')
+        response = self.set_reaction('dislike')
+        self.assertEqual(response.data, {
+            "reaction": "dislike", "likes": 0, "dislikes": 1})
+        self.assertEqual(Reaction.objects.filter(
+            article=self.article, user=self.reader).count(), 1)
+
+        response = self.set_reaction(None)
+        self.assertEqual(response.data, {
+            "reaction": None, "likes": 0, "dislikes": 0})
+
+    def test_set_invalid_reaction(self):
+        """
+        Test that only likes and dislikes can be set
+        """
+        response = self.set_reaction('love')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_viewer_state_in_one_query(self):
+        """
+        Test that the list tells the user which articles they reacted to,
+        with one query for the whole page
+        """
+        queries, response = self.count_list_queries(user=self.reader)
+        article = response.data['results'][0]
+        self.assertEqual(
+            (article['liked'], article['disliked'], article['favorited']),
+            (True, False, True))
+
+        for number in range(3):
+            article = Article.objects.create(
+                title=f"Article {number}", description="Are you ready?",
+                body="It takes grit", author=self.author,
+                slug=f"article-{number}")
+            article.set_reaction(self.reader, Reaction.DISLIKE)
+        queries_after, response = self.count_list_queries(user=self.reader)
+        self.assertEqual(queries_after, queries)
+        self.assertEqual(
+            [article['disliked'] for article in response.data['results']],
+            [True, True, True, False])
+
+        response = self.count_list_queries()[1]
+        self.assertNotIn('liked', response.data['results'][0])
+
+    def test_reading_stats_saved(self):
+        """
+        Test that the reading statistics are stored with the body and
+        backfilled by the management command
+        """
+        self.article.body = "<p>It takes grit</p> " + "and time " * 200
+        self.article.save()
+        self.assertEqual(self.article.word_count, 403)
+        self.assertEqual(self.article.reading_time_minutes, 3)
+        self.assertTrue(self.article.excerpt.startswith(
+            "It takes grit and time"))
+        self.assertLessEqual(len(self.article.excerpt), 300)
+
+        Article.objects.update(word_count=0, reading_time_minutes=0,
+                               excerpt='')
+        call_command('backfill_reading_stats', stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.word_count, 403)
+
+        response = self.count_list_queries()[1]
+        article = response.data['results'][0]
+        self.assertEqual(article['readingTimeMinutes'], 3)
+        self.assertNotIn('body', article)
+
+    def test_rebuild_reaction_counts_command(self):
+        """
+        Test that the management command recomputes drifted counters
+        """
+        Article.objects.update(likes_count=0, dislikes_count=7,
+                               favorites_count=0)
+        call_command('rebuild_reaction_counts', stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.dislikes_count, 0)
+        self.assertEqual(self.article.favorites_count, 2)
+
+    def count_list_queries(self, user=None):
+        request = self.request_factory.get(
+            self.articles_url + '?fields=summary')
+        if user is not None:
+            force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = ArticleList.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response
+
+    def test_compact_author_constant_queries(self):
+        """
+        Test that the embedded author is compact and that listing more
+        articles of active authors does not cost more queries
+        """
+        queries, response = self.count_list_queries()
+        self.assertEqual(set(response.data['results'][0]['author']),
+                         {'username', 'bio', 'image'})
+
+        for number in range(3):
+            article = Article.objects.create(
+                title=f"Article {number}", description="Are you ready?",
+                body="It takes grit", author=self.reader,
+                slug=f"article-{number}")
+            article.set_reaction(self.author, Reaction.LIKE)
+            article.add_favorite(self.author)
+        self.assertEqual(self.count_list_queries()[0], queries)
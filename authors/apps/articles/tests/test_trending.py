@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+
+from authors.apps.articles.models import Article, Reaction, TrendingScore
+from authors.apps.articles.views import TrendingArticles
+from authors.apps.authentication.models import User
+
+
+class TrendingTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.request_factory = APIRequestFactory()
+        self.author = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.readers = [User.objects.create(
+            username=f'reader{number}', email=f'reader{number}@gmail.com',
+            password='1232444nm') for number in range(3)]
+        self.older = Article.objects.create(
+            title="Older", description="Are you ready?",
+            body="It takes grit", author=self.author, slug="older")
+        self.newer = Article.objects.create(
+            title="Newer", description="Are you ready?",
+            body="It takes grit", author=self.author, slug="newer")
+
+    def get_trending(self):
+        request = self.request_factory.get(
+            reverse('articles:trending_articles'))
+        response = TrendingArticles.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article['slug'] for article in response.data['results']]
+
+    def test_activity_ranks_articles(self):
+        """
+        Test that activity lifts an article above a newer one
+        """
+        for reader in self.readers:
+            self.older.set_reaction(reader, Reaction.LIKE)
+            self.older.add_favorite(reader)
+        call_command('refresh_trending', stdout=StringIO())
+        self.assertEqual(self.get_trending(), ['older', 'newer'])
+
+    def test_refresh_only_touches_active_articles(self):
+        """
+        Test that a refresh only scores the articles with new activity
+        """
+        self.assertEqual(TrendingScore.objects.refresh(), 2)
+        self.assertEqual(TrendingScore.objects.refresh(), 0)
+
+        score = TrendingScore.objects.get(article=self.newer).score
+        for reader in self.readers:
+            self.newer.set_reaction(reader, Reaction.DISLIKE)
+        self.assertEqual(TrendingScore.objects.refresh(), 1)
+        self.assertLess(
+            TrendingScore.objects.get(article=self.newer).score, score)
+        self.assertEqual(TrendingScore.objects.refresh(full=True), 2)
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIRequestFactory
@@ -102,6 +104,41 @@ class ArticleTests(APITestCase):
         update_response = detail_view(update_request, slug=slug)
         self.assertEqual(update_response.status_code, status.HTTP_200_OK)
 
+    def test_title_edit_redirects_old_slug(self):
+        """
+        Test that editing the title fetches the article once and that its
+        old slug redirects to the new one
+        """
+        user = User.objects.get(username='olivia')
+        request = self.request_factory.post(self.articles_url, self.data)
+        force_authenticate(request, user=user)
+        old_slug = ArticleList.as_view()(request).data['slug']
+
+        detail_view = ArticleDetail.as_view()
+        url = reverse('articles:article_detail', kwargs={"slug": old_slug})
+        request = self.request_factory.put(
+            url, dict(self.data, title="Python in four weeks"))
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = detail_view(request, slug=old_slug)
+        new_slug = response.data['slug']
+        self.assertNotEqual(new_slug, old_slug)
+        fetches = [query for query in queries.captured_queries
+                   if query['sql'].startswith('SELECT') and
+                   '"articles_article"."slug" =' in query['sql']]
+        self.assertEqual(len(fetches), 1)
+
+        response = detail_view(self.request_factory.get(url), slug=old_slug)
+        self.assertEqual(response.status_code,
+                         status.HTTP_301_MOVED_PERMANENTLY)
+        self.assertTrue(response['Location'].endswith(
+            reverse('articles:article_detail', kwargs={"slug": new_slug})))
+
+        request = self.request_factory.delete(url)
+        force_authenticate(request, user=user)
+        response = detail_view(request, slug=old_slug)
+        self.assertEqual(response.status_code, 308)
+
     def test_delete_article_successful(self):
         """
         Test user can successfully delete an article
@@ -151,6 +188,102 @@ class ArticleTests(APITestCase):
             response.data['next'],
             'http://testserver/api/v1/articles/?limit=2&offset=2')
 
+    def test_cursor_pagination(self):
+        """
+        Test that the list is paged with cursors by default, newest first
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        slugs = []
+        for _ in range(3):
+            request = self.request_factory.post(
+                self.articles_url, self.data, format='json')
+            force_authenticate(request, user=user)
+            slugs.append(view(request).data['slug'])
+
+        request = self.request_factory.get(self.articles_url + '?page_size=2')
+        force_authenticate(request, user=user)
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual([article['slug'] for article in
+                          response.data['results']], slugs[:0:-1])
+
+        request = self.request_factory.get(response.data['next'])
+        force_authenticate(request, user=user)
+        response = view(request)
+        self.assertEqual([article['slug'] for article in
+                          response.data['results']], slugs[:1])
+        self.assertIsNone(response.data['next'])
+
+    def test_sparse_fieldsets(self):
+        """
+        Test that the list can be restricted to some fields or the summary
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+
+        request = self.request_factory.get(
+            self.articles_url + '?fields=title,slug')
+        response = view(request)
+        self.assertEqual(set(response.data['results'][0]), {'title', 'slug'})
+
+        request = self.request_factory.get(
+            self.articles_url + '?fields=summary')
+        response = view(request)
+        article = response.data['results'][0]
+        self.assertIn('likes', article)
+        self.assertNotIn('body', article)
+        self.assertNotIn('favorited', article)
+
+        request = self.request_factory.get(
+            self.articles_url + '?fields=title,password')
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_leaves_out_bodies(self):
+        """
+        Test that the list does not read the bodies unless they are asked
+        for, and that the article itself still has its body
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        slug = view(request).data['slug']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = view(self.request_factory.get(self.articles_url))
+        self.assertIn('title', response.data['results'][0])
+        self.assertNotIn('body', response.data['results'][0])
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'articles_articlebody' in query['sql']])
+
+        with CaptureQueriesContext(connection) as body_queries:
+            response = view(self.request_factory.get(
+                self.articles_url + '?fields=title,body'))
+        self.assertEqual(response.data['results'][0]['body'],
+                         "It takes grit")
+        self.assertLessEqual(len(body_queries), len(queries))
+
+        request = self.request_factory.get(
+            reverse('articles:article_detail', kwargs={'slug': slug}))
+        response = ArticleDetail.as_view()(request, slug=slug)
+        self.assertEqual(response.data['body'], "It takes grit")
+
+    def test_invalid_cursor(self):
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.get(self.articles_url + '?cursor=abc')
+        force_authenticate(request, user=user)
+        response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_when_no_article_pagination(self):
         user = User.objects.get(username='olivia')
         view = ArticleList.as_view()
@@ -175,7 +308,7 @@ class ArticleTests(APITestCase):
             self.articles_url+'?author__username=olivia')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertNotEqual(search_response.data, [])
+        self.assertNotEqual(search_response.data['results'], [])
 
     def test_search_article_by_non_author(self):
         """
@@ -191,7 +324,7 @@ class ArticleTests(APITestCase):
             self.articles_url+'?author__username=random author')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertEqual(search_response.data, [])
+        self.assertEqual(search_response.data['results'], [])
 
     def test_search_article_by_content(self):
         """
@@ -207,7 +340,7 @@ class ArticleTests(APITestCase):
             self.articles_url + '?body=It takes grit')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertNotEqual(search_response.data, [])
+        self.assertNotEqual(search_response.data['results'], [])
 
     def test_search_article_by_non_existent_content(self):
         """
@@ -223,7 +356,7 @@ class ArticleTests(APITestCase):
             self.articles_url + '?body=kjkfhdsajkfg')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertEqual(search_response.data, [])
+        self.assertEqual(search_response.data['results'], [])
 
     def test_search_article_by_tags(self):
         """
@@ -239,7 +372,7 @@ class ArticleTests(APITestCase):
             self.articles_url + '?tagList=javascript')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertNotEqual(search_response.data, [])
+        self.assertNotEqual(search_response.data['results'], [])
 
     def test_search_article_by_non_existent_tags(self):
         """
@@ -255,7 +388,114 @@ class ArticleTests(APITestCase):
             self.articles_url + '?tagList=hjsjdkgfadf')
         force_authenticate(search_request, user=user)
         search_response = view(search_request)
-        self.assertEqual(search_response.data, [])
+        self.assertEqual(search_response.data['results'], [])
+
+    def test_full_text_search(self):
+        """
+        Test that user can search articles with the full text search
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+        search_request = self.request_factory.get(
+            self.articles_url + '?q=python coders')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(len(search_response.data['results']), 1)
+        self.assertEqual(search_response.data['results'][0]['title'],
+                         self.data['title'])
+
+    def test_full_text_search_no_match(self):
+        """
+        Test that the full text search returns nothing for unknown words
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+        search_request = self.request_factory.get(
+            self.articles_url + '?q=kjkfhdsajkfg')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(search_response.data['results'], [])
+
+    def test_similar_author_search(self):
+        """
+        Test that user can find an author's articles despite a typo
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+        search_request = self.request_factory.get(
+            self.articles_url + '?author_similar=olivai')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(len(search_response.data['results']), 1)
+
+        search_request = self.request_factory.get(
+            self.articles_url + '?author_similar=olivai&similarity=0.9')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(search_response.data['results'], [])
+
+        # the threshold is not left on the connection for the next queries
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT show_limit()')
+            self.assertAlmostEqual(cursor.fetchone()[0], 0.3)
+
+        search_request = self.request_factory.get(
+            self.articles_url + '?author_similar=olivai&similarity=0.1')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(len(search_response.data['results']), 1)
+
+    def test_similar_title_search(self):
+        """
+        Test that user can find an article by a misspelt title
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+        search_request = self.request_factory.get(
+            self.articles_url + '?title_similar=pyhton coder in three weeks')
+        force_authenticate(search_request, user=user)
+        search_response = view(search_request)
+        self.assertEqual(len(search_response.data['results']), 1)
+
+    def test_search_article_by_exact_tags(self):
+        """
+        Test that tag filters match whole tags, all of them by default or
+        any of them with tag_mode=any
+        """
+        user = User.objects.get(username='olivia')
+        view = ArticleList.as_view()
+        request = self.request_factory.post(
+            self.articles_url, self.data, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+
+        for query, found in (('?tag=py', 0),
+                             ('?tag=python', 1),
+                             ('?tag=python&tag=ruby', 0),
+                             ('?tag=python&tag=javascript', 1),
+                             ('?tag=python&tag=ruby&tag_mode=any', 1)):
+            search_request = self.request_factory.get(
+                self.articles_url + query)
+            force_authenticate(search_request, user=user)
+            search_response = view(search_request)
+            self.assertEqual(len(search_response.data['results']), found,
+                             query)
 
 
 class LikeDislikeTests(APITestCase):
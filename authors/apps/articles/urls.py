@@ -6,16 +6,28 @@ app_name = "articles"
 
 urlpatterns = [
     path('', views.ArticleList.as_view(), name='all_articles'),
+    path('feed/', views.ArticleFeed.as_view(), name='article_feed'),
+    path('export/', views.ArticleExport.as_view(), name='article_export'),
+    path('trending/', views.TrendingArticles.as_view(),
+         name='trending_articles'),
     path('<str:slug>/', views.ArticleDetail.as_view(), name='article_detail'),
     path('<str:slug>/like/', views.LikeArticle.as_view(), name='like_article'),
     path(
         '<str:slug>/dislike/',
         views.DislikeArticle.as_view(),
         name='dislike_article'),
+    path(
+        '<str:slug>/reaction/',
+        views.ArticleReaction.as_view(),
+        name='article_reaction'),
     path('<str:slug>/ratings',
          include('authors.apps.ratings.urls', namespace='ratings')),
     path(
         '<str:slug>/favorite/',
         views.FavoriteArticle.as_view(),
         name='article_favorite'),
+    path(
+        '<str:slug>/favorite/users/',
+        views.ArticleFavoriters.as_view(),
+        name='article_favoriters'),
 ]
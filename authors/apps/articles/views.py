@@ -1,19 +1,38 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, TextField
+from django.db.models.functions import Cast, Upper
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
 from django.utils.text import slugify
 from django_filters import rest_framework as filters
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import SearchQuery, SearchRank, \
+    TrigramSimilarity
 import django_filters
 import uuid
 
-from rest_framework import generics, status
-from rest_framework.exceptions import NotFound
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, \
-    IsAuthenticated
+from rest_framework import generics, status, views
+from rest_framework.exceptions import APIException, NotFound, \
+    ValidationError
+from rest_framework.permissions import IsAdminUser, \
+    IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
 
-from authors.apps.authentication.models import User
-from .models import Article
-from .serializers import ArticleSerializer
+from .cache import cache_detail, get_cached_detail, is_enabled
+from .conditional import article_validators, collection_validators, \
+    not_modified, set_validators
+from .export import FORMATS, OPTIONAL_FIELDS, export_lines
+from .models import Article, Reaction, SEARCH_CONFIG, SlugHistory
+from .pagination import ArticleLimitOffsetPagination, ArticlePagination, \
+    FavoritersPagination, FeedPagination
+from .serializers import ArticleSerializer, FavoriterSerializer, \
+    ReactionSerializer
+
+
+# The similarity from which pg_trgm's `%` operator matches, as long as the
+# `pg_trgm.similarity_threshold` of the database is not changed
+TRIGRAM_DEFAULT_LIMIT = 0.3
 
 
 class ArticleFilter(filters.FilterSet):
@@ -24,9 +43,76 @@ class ArticleFilter(filters.FilterSet):
     title = filters.CharFilter(field_name='title', lookup_expr='icontains')
     description = filters.CharFilter(
         field_name='description', lookup_expr='icontains')
-    body = filters.CharFilter(field_name='body', lookup_expr='icontains')
+    body = filters.CharFilter(field_name='content__text',
+                              lookup_expr='icontains')
     author__username = filters.CharFilter(
         field_name='author__username', lookup_expr='icontains')
+    q = filters.CharFilter(method='search')
+    title_similar = filters.CharFilter(field_name='title', method='similar')
+    author_similar = filters.CharFilter(
+        field_name='author__username', method='similar')
+    similarity = filters.NumberFilter(method='option')
+    tag = filters.CharFilter(method='tags')
+    tag_mode = filters.ChoiceFilter(
+        choices=(('all', 'all'), ('any', 'any')), method='option')
+
+    @staticmethod
+    def search(queryset, name, value):
+        """
+        Full text search over the title, description, body and tags using
+        the indexed search vector, best matches first
+        """
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)).order_by('-rank')
+
+    @staticmethod
+    def option(queryset, name, value):
+        """
+        Options such as `similarity` and `tag_mode` are read by the other
+        filters, they do not filter anything on their own
+        """
+        return queryset
+
+    def tags(self, queryset, name, value):
+        """
+        Exact tag matching on the GIN indexed tag list. `?tag=a&tag=b` finds
+        the articles having all the tags, or any of them with `tag_mode=any`
+        """
+        tags = [tag for tag in self.data.getlist('tag') if tag]
+        if self.form.cleaned_data.get('tag_mode') == 'any':
+            # `&&`: the arrays have at least one tag in common
+            return queryset.filter(tagList__overlap=tags)
+        # `@>`: the article's tags include all the requested ones
+        return queryset.filter(tagList__contains=tags)
+
+    def similar(self, queryset, name, value):
+        """
+        Typo tolerant search on a field using trigram similarity, most
+        similar first. The `%` operator is served by the trigram index on
+        `UPPER(<field>::text)`, the same expression `icontains` uses. It
+        matches from pg_trgm's default limit, which is left as it is on the
+        connection, so the requested threshold is compared separately and
+        `%` only narrows the search when the threshold is not lower.
+        """
+        threshold = self.form.cleaned_data.get('similarity')
+        if threshold is None:
+            threshold = settings.TRIGRAM_SIMILARITY_THRESHOLD
+        threshold = min(max(float(threshold), 0.0), 1.0)
+
+        target = Upper(Cast(name, TextField()))
+        alias = name.replace('__', '_')
+        queryset = queryset.annotate(**{
+            f'{alias}_text': target,
+            f'{alias}_similarity': TrigramSimilarity(target, value),
+        }).filter(**{
+            f'{alias}_similarity__gte': threshold,
+        })
+        if threshold >= TRIGRAM_DEFAULT_LIMIT:
+            queryset = queryset.filter(**{
+                f'{alias}_text__trigram_similar': value,
+            })
+        return queryset.order_by(f'-{alias}_similarity')
 
     class Meta:
         """
@@ -35,7 +121,7 @@ class ArticleFilter(filters.FilterSet):
         """
         model = Article
         fields = [
-            'title', 'description', 'body', 'author__username', 'tagList'
+            'title', 'description', 'author__username', 'tagList'
         ]
         filter_overrides = {
             ArrayField: {
@@ -46,14 +132,164 @@ class ArticleFilter(filters.FilterSet):
         }
 
 
+class ArticleSummaryMixin:
+    """
+    Lists the articles without their bodies, which are only loaded where a
+    single article is shown
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', ArticleSerializer.list_fields())
+        return super(ArticleSummaryMixin, self).get_serializer(
+            *args, **kwargs)
+
+
+class ArticleFeed(ArticleSummaryMixin, generics.ListAPIView):
+    """
+    The articles of the authors the user follows, newest first
+    """
+    queryset = Article.objects.with_stats().defer('search_vector') \
+        .select_related('author')
+    serializer_class = ArticleSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = FeedPagination
+
+
+class TrendingArticles(ArticleSummaryMixin, generics.ListAPIView):
+    """
+    The articles ranked by their precomputed trending scores
+    """
+    queryset = Article.objects.with_stats().defer('search_vector') \
+        .select_related('author').filter(trending__isnull=False) \
+        .order_by('-trending__score', '-id')
+    serializer_class = ArticleSerializer
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = ArticleLimitOffsetPagination
+
+
+class ArticleExport(views.APIView):
+    """
+    Stream all the articles as JSON lines, or CSV with `?output=csv`.
+    `?include=author,tags,counts` adds these groups of fields.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        include = [name.strip() for name in
+                   request.query_params.get('include', '').split(',')
+                   if name.strip()]
+        errors = {}
+        if output not in FORMATS:
+            errors['output'] = [f'Choose one of {", ".join(FORMATS)}']
+        unknown = set(include) - set(OPTIONAL_FIELDS)
+        if unknown:
+            errors['include'] = [
+                f'Unknown group: {name}' for name in sorted(unknown)]
+        if errors:
+            raise ValidationError(errors)
+
+        content_type = 'text/csv' if output == 'csv' else \
+            'application/x-ndjson'
+        response = StreamingHttpResponse(export_lines(output, include),
+                                         content_type=content_type)
+        response['Content-Disposition'] = \
+            f'attachment; filename="articles.{output}"'
+        return response
+
+
+class ArticleMoved(APIException):
+    """
+    The article is now found at another slug. Reads are redirected with a
+    301, other methods with a 308 so that clients repeat them unchanged.
+    """
+    default_detail = 'The article has moved.'
+
+    def __init__(self, request, slug):
+        super(ArticleMoved, self).__init__()
+        self.location = request.build_absolute_uri(
+            reverse('articles:article_detail', kwargs={'slug': slug}))
+        if request.META.get('QUERY_STRING'):
+            self.location += '?' + request.META['QUERY_STRING']
+        if request.method in ('GET', 'HEAD'):
+            self.status_code = status.HTTP_301_MOVED_PERMANENTLY
+        else:
+            # Permanent Redirect
+            self.status_code = 308
+
+
 class ArticleList(generics.ListCreateAPIView):
-    queryset = Article.objects.all()
+    queryset = Article.objects.with_stats().defer('search_vector') \
+        .select_related('author')
     serializer_class = ArticleSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = ArticlePagination
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = ArticleFilter
 
+    def list(self, request, *args, **kwargs):
+        """
+        List the articles, or answer 304 if the client's copy of this page
+        is still current. The lists only have validators when the cache
+        holding their version is shared.
+        """
+        if not is_enabled():
+            return super(ArticleList, self).list(request, *args, **kwargs)
+        etag, last_modified = collection_validators(request)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = super(ArticleList, self).list(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def get_fields(self):
+        """
+        The representation fields asked for with `?fields=a,b` or
+        `?fields=summary`, by default all of them but the body
+        :rtype: tuple
+        """
+        if not hasattr(self, '_fields'):
+            requested = self.request.query_params.get('fields')
+            if not requested:
+                self._fields = ArticleSerializer.list_fields()
+            elif requested == 'summary':
+                self._fields = ArticleSerializer.SUMMARY_FIELDS
+            else:
+                self._fields = tuple(
+                    name.strip() for name in requested.split(',')
+                    if name.strip())
+                unknown = set(self._fields) - set(
+                    ArticleSerializer().fields) - set(
+                    ArticleSerializer.VIEWER_FIELDS)
+                if unknown:
+                    raise ValidationError({'fields': [
+                        f'Unknown field: {name}' for name in sorted(unknown)]})
+        return self._fields
+
+    def get_queryset(self):
+        """
+        Only load the columns and aggregates needed by the requested fields
+        """
+        if self.request.method != 'GET':
+            return super(ArticleList, self).get_queryset()
+        fields = self.get_fields()
+
+        # the pagination always orders by and reads the (createdAt, id) key
+        columns = ArticleSerializer.columns(fields) | {'id', 'createdAt'}
+        queryset = Article.objects.only(*columns)
+        if 'author' in fields:
+            queryset = queryset.select_related('author')
+        if 'body' in fields:
+            queryset = queryset.select_related('content')
+        if {'averageRating', 'ratingsCount'} & set(fields):
+            queryset = queryset.with_stats()
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs['fields'] = self.get_fields()
+        return super(ArticleList, self).get_serializer(*args, **kwargs)
+
     def get_serializer_context(self):
         context = super(ArticleList, self).get_serializer_context()
         request = context["request"]
@@ -67,34 +303,116 @@ class ArticleList(generics.ListCreateAPIView):
 
 
 class ArticleDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Article.objects.all()
+    queryset = Article.objects.with_stats().defer('search_vector') \
+        .select_related('author', 'content')
     serializer_class = ArticleSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
     lookup_field = 'slug'
 
-    def get_serializer_context(self):
-        context = super(ArticleDetail, self).get_serializer_context()
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the article from the cache when possible, the `X-Cache` header
+        tells whether it was a HIT or a MISS. Clients whose copy is still
+        current get a 304 before anything is serialized.
+        """
+        if not is_enabled():
+            return self.retrieve_uncached(request)
+        slug = kwargs['slug']
+        if not Article.objects.filter(slug=slug).exists():
+            # redirects clients using a former slug, or is a 404
+            self.get_object()
+        # the version is read before the article, so that a write in
+        # between makes the copy cached below unreachable
+        version, entry = get_cached_detail(slug)
+        if entry is not None:
+            etag, last_modified = entry['etag'], entry['last_modified']
+            response = not_modified(request, etag, last_modified)
+            if response is None:
+                data = self.with_viewer_state(entry['data'])
+                response = set_validators(Response(data), etag,
+                                          last_modified)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        instance = self.get_object()
+        etag, last_modified = article_validators(instance)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            data = self.get_serializer(instance).data
+            # the cached copy is shared by all users
+            cache_detail(slug, version, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': {key: value for key, value in data.items()
+                         if key not in ArticleSerializer.VIEWER_FIELDS},
+            })
+            response = set_validators(Response(data), etag, last_modified)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def retrieve_uncached(self, request):
+        instance = self.get_object()
+        etag, last_modified = article_validators(instance)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+            set_validators(response, etag, last_modified)
+        return response
+
+    def with_viewer_state(self, data):
+        """
+        Add the requesting user's reactions to a cached article
+        """
+        if not self.request.user.is_authenticated:
+            return data
+        state = Reaction.objects.viewer_states(
+            self.request.user, [data['id']])[data['id']]
+        return dict(data, **state)
+
+    def get_object(self):
+        """
+        Look the article up by its slug, redirecting clients that used one
+        of its former slugs
+        """
         try:
-            url_slug = self.kwargs['slug']
-        except Exception:
-            raise NotFound('Please check your url')
-        request_title = context["request"].data.get("title", "")
-        if request_title == Article.objects.get(slug=url_slug).title or \
-                request_title == "":
-            slug = url_slug
+            return super(ArticleDetail, self).get_object()
+        except Http404:
+            slug = SlugHistory.objects.current_slug(self.kwargs['slug'])
+            if slug is None:
+                raise
+            raise ArticleMoved(self.request, slug)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ArticleMoved):
+            return Response(status=exc.status_code,
+                            headers={'Location': exc.location})
+        return super(ArticleDetail, self).handle_exception(exc)
+
+    def perform_update(self, serializer):
+        """
+        Give the article a new slug when its title is changed. The slug is
+        never taken from the request.
+        """
+        article = serializer.instance
+        title = serializer.validated_data.get('title', article.title)
+        if title == article.title:
+            slug = article.slug
         else:
-            slug_text = request_title + " " + uuid.uuid4().hex
-            slug = slugify(slug_text)
-        context["request"].data.update({"slug": slug})
-        return context
+            slug = slugify(title + " " + uuid.uuid4().hex)
+        serializer.save(slug=slug)
+
+
+def get_article_or_404(slug):
+    try:
+        return Article.objects.get(slug=slug)
+    except Article.DoesNotExist:
+        raise NotFound('An article with this slug does not exist.')
 
 
 class LikeArticle(generics.UpdateAPIView):
     """
-    Add the user to the list of liking users and
-    remove the user from the list of disliking users.
-    If the user likes for a second time,
-    we remove the user from the list of liking users
+    Like the article, replacing the user's dislike if any.
+    If the user likes for a second time, the like is removed
     """
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
@@ -102,39 +420,21 @@ class LikeArticle(generics.UpdateAPIView):
 
     def update(self, request, slug):
         """Update the user's liking status on a particular article."""
-        user = request.user
-
-        try:
-            article = Article.objects.get(slug=slug)
-        except Exception:
-            raise NotFound('An article with this slug does not exist.')
-
-        # removes the user from the list of disliking users,
-        # nothing changes if the user does not exist in the list of
-        # disliking users
-        article.dislikes.remove(user.id)
+        article = get_article_or_404(slug)
 
         # allows for the None option: you neither like nor dislike the article
-        if user in article.likes.all():
-            # removes the user from the list of liking users
-            article.likes.remove(user.id)
-
+        if article.toggle_reaction(request.user, Reaction.LIKE) is None:
             response = {"Message": "You no longer like this article"}
             return Response(response, status=status.HTTP_200_OK)
 
-        # adds the user to the list of liking users
-        article.likes.add(user.id)
-
         response = {"Message": "You have successfully liked this article"}
         return Response(response, status=status.HTTP_200_OK)
 
 
 class DislikeArticle(generics.UpdateAPIView):
     """
-    Add the user to the list of disliking users and
-    remove the user from the list of liking users.
-    If the user dislikes for a second time,
-    we remove the user from the list of disliking users
+    Dislike the article, replacing the user's like if any.
+    If the user dislikes for a second time, the dislike is removed
     """
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
@@ -142,33 +442,53 @@ class DislikeArticle(generics.UpdateAPIView):
 
     def update(self, request, slug):
         """Update the user's disliking status on a particular article."""
-        user = request.user
-
-        try:
-            article = Article.objects.get(slug=slug)
-        except Exception:
-            raise NotFound('An article with this slug does not exist.')
-
-        # removes the user from the list of liking users,
-        # nothing changes if the user does not exist in the  list of liking
-        # users
-        article.likes.remove(user.id)
+        article = get_article_or_404(slug)
 
         # allows for the None option: you neither like nor dislike the article
-        if user in article.dislikes.all():
-            # removes the user from the list of disliking users
-            article.dislikes.remove(user.id)
-
+        if article.toggle_reaction(request.user, Reaction.DISLIKE) is None:
             response = {"Message": "You no longer dislike this article"}
             return Response(response, status=status.HTTP_200_OK)
 
-        # adds the user to the list of disliking users
-        article.dislikes.add(user.id)
-
         response = {"Message": "You have successfully disliked this article"}
         return Response(response, status=status.HTTP_200_OK)
 
 
+class ArticleReaction(generics.GenericAPIView):
+    """
+    Set the user's reaction to an article explicitly, unlike the like and
+    dislike toggles sending the same request twice gives the same state
+    """
+    queryset = Article.objects.all()
+    serializer_class = ReactionSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def reply(self, article, reaction):
+        return Response({
+            "reaction": reaction,
+            "likes": article.likes_count,
+            "dislikes": article.dislikes_count,
+        }, status=status.HTTP_200_OK)
+
+    def put(self, request, slug):
+        """
+        Set the reaction to `like`, `dislike` or null for none
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reaction = serializer.validated_data['reaction']
+        article = get_article_or_404(slug)
+        article.set_reaction(request.user, reaction)
+        return self.reply(article, reaction)
+
+    def delete(self, request, slug):
+        """
+        Remove the user's reaction
+        """
+        article = get_article_or_404(slug)
+        article.set_reaction(request.user, None)
+        return self.reply(article, None)
+
+
 class FavoriteArticle(generics.ListCreateAPIView, generics.DestroyAPIView):
     """
     Add or removes a user and article to the list of users liking different
@@ -182,81 +502,90 @@ class FavoriteArticle(generics.ListCreateAPIView, generics.DestroyAPIView):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
 
+    @staticmethod
+    def get_article(slug):
+        """
+        Only the columns needed to change the favorites are loaded, the
+        cost of favoriting does not depend on the size of the article
+        """
+        return Article.objects.only('id', 'slug', 'favorites_count') \
+            .get(slug=slug)
+
+    @staticmethod
+    def favorite_state(article, favorited):
+        return Response({
+            "favorited": favorited,
+            "favoritesCount": article.favorites_count,
+        }, status=status.HTTP_200_OK)
+
     def post(self, request, slug):
         """
         Helps user favourite article
-        If already, return message saying that the user has already favourited
+        If already, the user no longer favourites the article
         Else make the user favourite article
         :param request:
         :param slug:
-        :return: article
+        :return: whether the user now favourites the article and the
+        number of users that do
         ":return: response
         """
         try:
-            article = Article.objects.get(slug=slug)
-        except Exception:
+            article = self.get_article(slug)
+        except Article.DoesNotExist:
             response = {
                 "message": "The article was not found",
             }
             return Response(response, status=status.HTTP_404_NOT_FOUND)
         user = request.user
 
-        if user in article.favorited.all():
+        with transaction.atomic():
             # Remove the user from the list of the ones that have favourited
             #  article
+            unfavorited = article.remove_favorite(user)
+            if not unfavorited:
+                # Add user from the list of users liking the particular
+                # article
+                article.add_favorite(user)
 
-            article.favorited.remove(user.id)
-
-            serializer = self.get_serializer(article)
-            response = {"article": serializer.data}
-            return Response(response, status=status.HTTP_200_OK)
-
-        else:
-            # Add user from the list of users liking the particular article
-            article.favorited.add(user.id)
-
-            serializer = self.get_serializer(article)
-
-            favorited_users = []
-            for user_id in serializer.data['favorited']:
-                username = User.objects.get(id=user_id).email
-                favorited_users.append(username)
-
-            output = serializer.data
-            output['favoriting_users'] = favorited_users
-            response = {"article": output}
-            return Response(response, status=status.HTTP_200_OK)
+        return self.favorite_state(article, not unfavorited)
 
     def delete(self, request, slug):
         """
         Helps user un-favourite article
-        If already, return article
-        Else message saying that the user has not favourited article
         :param request:
         :param slug:
-        :return: article
+        :return: the user no longer favourites the article and the number
+        of users that do
         ":return: response
         """
 
         try:
-            article = Article.objects.get(slug=slug)
-        except Exception:
+            article = self.get_article(slug)
+        except Article.DoesNotExist:
             response = {
                 "message": "The article was not found",
             }
             return Response(response, status=status.HTTP_404_NOT_FOUND)
-        user = request.user
 
-        if user in article.favorited.all():
-            # Remove user from the list of users liking the particular article
-            article.favorited.remove(user.id)
+        # Remove user from the list of users liking the particular article
+        article.remove_favorite(request.user)
+        return self.favorite_state(article, False)
 
-            serializer = self.get_serializer(article)
-            response = {"article": serializer.data}
-            return Response(response, status=status.HTTP_200_OK)
-        else:
-            # Returns a message that the user has already favourited article
-            response = {
-                "message": "You have not marked this article as a favourite"
-            }
-            return Response(response, status=status.HTTP_200_OK)
+
+class ArticleFavoriters(generics.ListAPIView):
+    """
+    List the users who favorited an article, most recent first
+    """
+    serializer_class = FavoriterSerializer
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = FavoritersPagination
+
+    def get_queryset(self):
+        try:
+            article = Article.objects.only('id').get(slug=self.kwargs['slug'])
+        except Article.DoesNotExist:
+            raise NotFound('An article with this slug does not exist.')
+        # the users are read in the same query as the page
+        return Article.favorited.through.objects.filter(article=article) \
+            .select_related('user') \
+            .only('user__username', 'user__bio', 'user__image')
@@ -0,0 +1,19 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_user_follows'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Matches the `UPPER(username::text)` expression used by both the
+        # `icontains` lookup and the trigram similarity filter on articles
+        migrations.RunSQL(
+            'CREATE INDEX user_username_trgm_idx ON authentication_user '
+            'USING gin (UPPER(username::text) gin_trgm_ops);',
+            'DROP INDEX IF EXISTS user_username_trgm_idx;'),
+    ]
@@ -9,6 +9,7 @@ from rest_framework.validators import UniqueValidator
 from authors.apps.core.e_mail import SendEmail
 from authors.settings import EMAIL_HOST_NAME, RESET_DOMAIN
 from .models import User
+from ..articles.models import Reaction
 
 
 def password_validator(password):
@@ -147,6 +148,11 @@ class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         max_length=128, min_length=8, write_only=True)
 
+    # The ids of the articles the user likes and dislikes, which are stored
+    # in the articles' reactions table
+    likes = serializers.SerializerMethodField()
+    dislikes = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = ('email', 'username', 'password', 'bio', 'image',
@@ -160,6 +166,18 @@ class UserSerializer(serializers.ModelSerializer):
         # `max_length` properties too, but that isn't the case for the token
         # field.
 
+    @staticmethod
+    def reacted_articles(instance, kind):
+        return list(instance.article_reactions.filter(kind=kind)
+                    .order_by('article_id')
+                    .values_list('article_id', flat=True))
+
+    def get_likes(self, instance):
+        return self.reacted_articles(instance, Reaction.LIKE)
+
+    def get_dislikes(self, instance):
+        return self.reacted_articles(instance, Reaction.DISLIKE)
+
     def update(self, instance, validated_data):
         """Performs an update on a User."""
 
@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['createdAt'], name='comment_created_idx'),
+        ),
+    ]
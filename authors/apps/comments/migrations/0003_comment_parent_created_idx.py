@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_comment_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'createdAt', 'id'], name='comment_parent_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_comment_parent_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'createdAt', 'id'], name='comment_article_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:38
+
+from django.db import migrations, models
+
+# Count the comments made before the counters were kept
+COUNT_COMMENTS = [
+    'UPDATE comments_comment SET replies_count = replies.total '
+    'FROM (SELECT parent_id, COUNT(*) AS total FROM comments_comment '
+    'WHERE parent_id IS NOT NULL GROUP BY parent_id) replies '
+    'WHERE replies.parent_id = comments_comment.id',
+    'UPDATE articles_article SET comments_count = comments.total '
+    'FROM (SELECT article, COUNT(*) AS total FROM comments_comment '
+    'GROUP BY article) comments '
+    'WHERE comments.article = articles_article.id',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0015_article_comments_count'),
+        ('comments', '0004_comment_article_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(COUNT_COMMENTS, migrations.RunSQL.noop),
+    ]
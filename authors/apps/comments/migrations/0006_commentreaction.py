@@ -0,0 +1,81 @@
+# Generated by Django 2.0.6 on 2026-10-18 10:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Moves the likes and dislikes join tables into the reactions table. A user
+# found in both keeps their like, so the counters are recomputed.
+COPY_REACTIONS = """
+INSERT INTO comments_commentreaction (user_id, comment_id, kind, "createdAt")
+SELECT user_id, comment_id, 'like', now() FROM comments_comment_likes
+ON CONFLICT DO NOTHING;
+INSERT INTO comments_commentreaction (user_id, comment_id, kind, "createdAt")
+SELECT user_id, comment_id, 'dislike', now() FROM comments_comment_dislikes
+ON CONFLICT DO NOTHING;
+UPDATE comments_comment SET
+    likes_count = (SELECT COUNT(*) FROM comments_commentreaction
+                   WHERE comment_id = comments_comment.id AND kind = 'like'),
+    dislikes_count = (SELECT COUNT(*) FROM comments_commentreaction
+                      WHERE comment_id = comments_comment.id
+                      AND kind = 'dislike');
+"""
+
+RESTORE_REACTIONS = """
+INSERT INTO comments_comment_likes (comment_id, user_id)
+SELECT comment_id, user_id FROM comments_commentreaction WHERE kind = 'like';
+INSERT INTO comments_comment_dislikes (comment_id, user_id)
+SELECT comment_id, user_id FROM comments_commentreaction
+WHERE kind = 'dislike';
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('comments', '0005_comment_replies_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentReaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('like', 'Like'), ('dislike', 'Dislike')], max_length=7)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='commentreaction',
+            name='comment',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='comments.Comment'),
+        ),
+        migrations.AddField(
+            model_name='commentreaction',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comment_reactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='commentreaction',
+            unique_together={('user', 'comment')},
+        ),
+        migrations.RunSQL(COPY_REACTIONS, RESTORE_REACTIONS),
+        migrations.RemoveField(
+            model_name='comment',
+            name='dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='likes',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-18 11:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0006_commentreaction'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_created_idx',
+        ),
+    ]
@@ -1,7 +1,54 @@
 """Define our database tables."""
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
 from ..authentication.models import User
-from ..articles.models import Article
+from ..articles.models import Article, Reaction
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def thread(self, article, root=None, max_depth=5, limit=20, after=None):
+        """
+        The comments of the article's threads, or the `root` comment and the
+        replies under it, fetched in one query. A recursive CTE walks down
+        from the top comments at most `max_depth` levels of replies, taking
+        at most `limit` comments per level under each comment, earliest
+        first. Without a `root`, the threads start after the (createdAt, id)
+        key `after` if given, and one more top comment than `limit` is
+        fetched, without its replies, telling whether more threads follow.
+        :return: the comments in the order they were made
+        :rtype: CommentQuerySet
+        """
+        table = self.model._meta.db_table
+        if root is None:
+            after_key = ''
+            params = [limit, article.pk]
+            if after is not None:
+                after_key = 'AND ("createdAt", id) > (%s, %s) '
+                params += list(after)
+            top = (f'SELECT id, row_number() OVER ('
+                   f'ORDER BY "createdAt", id) > %s AS extra FROM {table} '
+                   f'WHERE article = %s AND parent_id IS NULL {after_key}'
+                   f'ORDER BY "createdAt", id LIMIT %s')
+            params.append(limit + 1)
+        else:
+            top = (f'SELECT id, false AS extra FROM {table} '
+                   f'WHERE article = %s AND id = %s')
+            params = [article.pk, root]
+        ids = RawSQL(
+            f'WITH RECURSIVE thread (id, depth, extra) AS ('
+            f'SELECT roots.id, 0, roots.extra FROM ({top}) roots '
+            f'UNION ALL '
+            f'SELECT reply.id, thread.depth + 1, false FROM thread '
+            f'CROSS JOIN LATERAL (SELECT id FROM {table} '
+            f'WHERE parent_id = thread.id '
+            f'ORDER BY "createdAt", id LIMIT %s) reply '
+            f'WHERE thread.depth < %s AND NOT thread.extra) '
+            f'SELECT id FROM thread', params + [limit, max_depth])
+        return self.filter(pk__in=ids).order_by('createdAt', 'pk')
 
 
 class Comment(models.Model):
@@ -13,21 +60,183 @@ class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_column='user')
     article = models.ForeignKey(
         Article, on_delete=models.CASCADE, db_column='article')
-    likes = models.ManyToManyField(
-        User, related_name='comment_likes', blank=True)
-    dislikes = models.ManyToManyField(
-        User, related_name='comment_dislikes', blank=True)
     parent = models.ForeignKey(
         'self',
         related_name='children',
         on_delete=models.CASCADE,
         default=None,
         null=True)
+    # kept up to date as replies are made and deleted
+    replies_count = models.PositiveIntegerField(default=0)
+
+    # Denormalized reaction counters, kept in step with the
+    # `CommentReaction` table by the reaction methods below
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+
+    objects = CommentQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # the counters are moved in the same transaction, by `signals`
+        with transaction.atomic():
+            super(Comment, self).save(*args, **kwargs)
+
+    def _shift_counters(self, **amounts):
+        """
+        Move the counters by the given amounts in the database and reload
+        them on this instance.
+        """
+        changes = {counter: F(counter) + amount
+                   for counter, amount in amounts.items() if amount}
+        if not changes:
+            return
+        Comment.objects.filter(pk=self.pk).update(**changes)
+        self.refresh_from_db(fields=list(changes))
+
+    def _count_reaction_change(self, previous, current):
+        if previous == current:
+            return
+        amounts = {}
+        if previous is not None:
+            amounts[Reaction.COUNTERS[previous]] = -1
+        if current is not None:
+            amounts[Reaction.COUNTERS[current]] = 1
+        self._shift_counters(**amounts)
+
+    def set_reaction(self, user, kind):
+        """
+        Set the user's reaction to the comment: `Reaction.LIKE`,
+        `Reaction.DISLIKE` or None for no reaction. Setting the same state
+        twice changes nothing.
+        :return: the user's previous reaction
+        :rtype: str or None
+        """
+        with transaction.atomic():
+            if kind is None:
+                previous = CommentReaction.objects.clear(self, user)
+            else:
+                previous = CommentReaction.objects.set_state(self, user, kind)
+            self._count_reaction_change(previous, kind)
+        return previous
+
+    def toggle_reaction(self, user, kind):
+        """
+        Give the comment the user's `kind` of reaction, or remove it if the
+        user had already reacted that way.
+        :return: the user's new reaction
+        :rtype: str or None
+        """
+        with transaction.atomic():
+            if CommentReaction.objects.clear(self, user, kind) is not None:
+                self._count_reaction_change(kind, None)
+                return None
+            self.set_reaction(user, kind)
+        return kind
 
     class Meta:
         """Order by time created, the most recently created is at the top."""
 
         ordering = ('createdAt',)
+        indexes = [
+            # the pages of the comments on an article
+            models.Index(fields=['article', 'createdAt', 'id'],
+                         name='comment_article_created_idx'),
+            # the earliest replies to a comment, read by `thread`
+            models.Index(fields=['parent', 'createdAt', 'id'],
+                         name='comment_parent_created_idx'),
+        ]
+
+
+class CommentReactionManager(models.Manager):
+    """
+    Changes the reactions to comments with single statements, so that
+    concurrent requests cannot leave a user with two reactions or count one
+    twice
+    """
+
+    def set_state(self, comment, user, kind):
+        """
+        Insert the user's reaction, or switch its kind if it is different.
+        :return: the user's previous reaction
+        :rtype: str or None
+        """
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            # `xmax` is 0 for a freshly inserted row. Nothing is returned
+            # when the reaction already had this kind.
+            cursor.execute(
+                f'INSERT INTO {table} '
+                f'(user_id, comment_id, kind, "createdAt") '
+                f'VALUES (%s, %s, %s, %s) '
+                f'ON CONFLICT (user_id, comment_id) DO UPDATE '
+                f'SET kind = EXCLUDED.kind, '
+                f'"createdAt" = EXCLUDED."createdAt" '
+                f'WHERE {table}.kind <> EXCLUDED.kind '
+                f'RETURNING xmax = 0',
+                [user.pk, comment.pk, kind, timezone.now()])
+            row = cursor.fetchone()
+        if row is None:
+            return kind
+        if row[0]:
+            return None
+        # there are only two kinds, so the reaction was the other one
+        return Reaction.DISLIKE if kind == Reaction.LIKE else Reaction.LIKE
+
+    def clear(self, comment, user, kind=None):
+        """
+        Delete the user's reaction, only if it is of `kind` when given.
+        :return: the kind of the deleted reaction, None if there was none
+        :rtype: str or None
+        """
+        table = self.model._meta.db_table
+        sql = f'DELETE FROM {table} WHERE user_id = %s AND comment_id = %s'
+        params = [user.pk, comment.pk]
+        if kind is not None:
+            sql += ' AND kind = %s'
+            params.append(kind)
+        with connection.cursor() as cursor:
+            cursor.execute(sql + ' RETURNING kind', params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def viewer_states(self, user, comment_ids):
+        """
+        Find out which of the comments the user likes and dislikes, with one
+        query.
+        :return: the `liked` and `disliked` flags of every comment by its id
+        :rtype: dict
+        """
+        states = {pk: {'liked': False, 'disliked': False}
+                  for pk in comment_ids}
+        if not states or not user.is_authenticated:
+            return states
+        flags = {Reaction.LIKE: 'liked', Reaction.DISLIKE: 'disliked'}
+        for pk, kind in self.filter(user=user, comment_id__in=states) \
+                .values_list('comment_id', 'kind'):
+            states[pk][flags[kind]] = True
+        return states
+
+
+class CommentReaction(models.Model):
+    """
+    A user's like or dislike of a comment. A user has at most one reaction
+    per comment, so liking and disliking exclude each other.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='comment_reactions')
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE,
+                                related_name='reactions')
+    kind = models.CharField(max_length=7, choices=Reaction.KINDS)
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    objects = CommentReactionManager()
+
+    def __str__(self):
+        return f'CommentReaction: <{self.user_id} {self.kind}s ' \
+            f'{self.comment_id}>'
+
+    class Meta:
+        unique_together = ('user', 'comment')
 
 
 class CommentHistory(models.Model):
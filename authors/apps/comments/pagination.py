@@ -0,0 +1,45 @@
+from django.db.models import Q
+
+from ..articles.pagination import KeysetPagination
+
+
+class CommentPagination(KeysetPagination):
+    """
+    Pages the comments on an article oldest first, with cursors holding the
+    (createdAt, id) key of the last comment of the page. Along with the
+    article the key is indexed, so every page is an index range scan no
+    matter how deep it is.
+    """
+
+    def fetch(self, queryset, position, size):
+        queryset = queryset.order_by('createdAt', 'id')
+        if position is not None:
+            created, pk = position
+            queryset = queryset.filter(createdAt__gte=created).filter(
+                Q(createdAt__gt=created) | Q(id__gt=pk))
+        return list(queryset[:size])
+
+
+class ThreadPagination(CommentPagination):
+    """
+    Pages the threads on an article by their top comments, oldest first,
+    with the same cursors as the comments. The top comments of the page and
+    the replies under them are fetched together by `CommentQuerySet.thread`.
+    """
+
+    def paginate_thread(self, queryset, article, request, max_depth, limit):
+        """
+        :return: the comments of the threads on the page
+        :rtype: list
+        """
+        self.request = request
+        comments = list(queryset.thread(
+            article, max_depth=max_depth, limit=limit,
+            after=self.decode_cursor(request)))
+        top = [comment for comment in comments if comment.parent_id is None]
+        # the extra top comment only tells that there is a next page
+        self.has_next = len(top) > limit
+        if self.has_next:
+            comments.remove(top[limit])
+        self.page = top[:limit]
+        return comments
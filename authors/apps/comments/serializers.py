@@ -1,25 +1,91 @@
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound, PermissionDenied
-from ..comments.models import Comment, CommentHistory
+from ..comments.models import Comment, CommentHistory, CommentReaction
 from ..articles.models import Article
-from ..authentication.serializers import UserSerializer
-from ..articles.serializers import ArticleSerializer
+from ..profiles.serializers import AuthorSerializer
+
+
+class CommentListSerializer(serializers.ListSerializer):
+    """
+    Serializes a page of comments, looking up the viewer's reactions to all
+    of them at once
+    """
+
+    def to_representation(self, data):
+        comments = list(data.all() if hasattr(data, 'all') else data)
+        self.child.load_viewer_states(comments)
+        return super(CommentListSerializer, self).to_representation(comments)
 
 
 class CommentSerializer(serializers.ModelSerializer):
     """serialize data for handling comments."""
 
-    user = UserSerializer(read_only=True)
-    article = ArticleSerializer(read_only=True)
-    likes = serializers.SerializerMethodField(method_name='get_likes_count')
-    dislikes = serializers.SerializerMethodField(
-        method_name='get_dislikes_count')
+    user = AuthorSerializer(read_only=True)
+    # the comments of a page all belong to the same article, which is only
+    # referred to by its slug
+    article = serializers.SlugRelatedField(slug_field='slug', read_only=True)
+    # the reaction counts are read from the counters stored on the comment
+    likes = serializers.IntegerField(source='likes_count', read_only=True)
+    dislikes = serializers.IntegerField(source='dislikes_count',
+                                        read_only=True)
+    repliesCount = serializers.IntegerField(source='replies_count',
+                                            read_only=True)
+
+    # Whether the requesting user likes or dislikes the comment, only shown
+    # to authenticated users
+    liked = serializers.SerializerMethodField()
+    disliked = serializers.SerializerMethodField()
 
     class Meta:
         """specify the model and fields to be used by the serializer."""
 
         model = Comment
-        fields = '__all__'
+        exclude = ('replies_count', 'likes_count', 'dislikes_count')
+        list_serializer_class = CommentListSerializer
+
+    VIEWER_FIELDS = ('liked', 'disliked')
+
+    def __init__(self, *args, **kwargs):
+        super(CommentSerializer, self).__init__(*args, **kwargs)
+        if self.viewer is None:
+            for name in self.VIEWER_FIELDS:
+                self.fields.pop(name, None)
+
+    @property
+    def viewer(self):
+        """
+        The authenticated user the comments are serialized for, if any
+        """
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
+
+    def load_viewer_states(self, comments):
+        """
+        Look up the viewer's reactions to all these comments in one query,
+        rather than one query per comment
+        """
+        if self.viewer is None:
+            return
+        states = self.context.setdefault('viewer_states', {})
+        states.update(CommentReaction.objects.viewer_states(
+            self.viewer, [comment.pk for comment in comments
+                          if comment.pk not in states]))
+
+    def viewer_state(self, comment, flag):
+        states = self.context.get('viewer_states', {})
+        if comment.pk not in states:
+            self.load_viewer_states([comment])
+            states = self.context['viewer_states']
+        return states[comment.pk][flag]
+
+    def get_liked(self, comment):
+        return self.viewer_state(comment, 'liked')
+
+    def get_disliked(self, comment):
+        return self.viewer_state(comment, 'disliked')
 
     def create(self, validated_data):
         """Handle creating a new comment."""
@@ -37,13 +103,25 @@ class CommentSerializer(serializers.ModelSerializer):
             user=user, article=article, **validated_data)
         return comment
 
-    def get_likes_count(self, instance):
-        """Get the total number of likes for a particular comment."""
-        return instance.likes.count()
 
-    def get_dislikes_count(self, instance):
-        """Get the total number of dislikes for a particular comment."""
-        return instance.dislikes.count()
+class CommentThreadSerializer(CommentSerializer):
+    """
+    Serializes a comment with its replies nested under it. The replies of
+    each comment are given in the `replies` context entry, by comment id.
+    """
+    replies = serializers.SerializerMethodField()
+
+    def get_replies(self, instance):
+        replies = self.context['replies'].get(instance.pk, [])
+        return CommentThreadSerializer(
+            replies, many=True, context=self.context).data
+
+
+class ThreadParamsSerializer(serializers.Serializer):
+    """Validates the depth and width of the threads asked for"""
+    max_depth = serializers.IntegerField(min_value=0, max_value=20,
+                                         default=5)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
 
 
 class CommentHistorySerializer(serializers.ModelSerializer):
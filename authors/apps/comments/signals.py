@@ -0,0 +1,102 @@
+"""
+Keep the comment counters of the articles and the reply counters of the
+comments in step with the comments. The counters are moved by receivers of
+the model signals so that the comments deleted in cascade, along with the
+comment they reply to, their article or their author, are counted too.
+
+A cascade sends the `pre_delete` signals of all its rows before deleting
+any, then the `post_delete` signals of the comments, latest first, before
+those of their articles. The rows whose deletion is in progress are noted
+on `pre_delete`, so that nothing is counted for the comments of a deleted
+article, and the replies deleted along with the comment they reply to are
+counted at once with that comment, which comes after them.
+"""
+import threading
+from collections import Counter
+
+from django.core.signals import request_started
+from django.db import connection
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Comment
+from ..articles.cache import invalidate_article
+from ..articles.models import Article
+
+
+class Deletions(threading.local):
+    """The articles and comments being deleted by the current thread"""
+
+    def __init__(self):
+        self.articles = set()
+        self.comments = set()
+        # the replies deleted along with the comment they reply to, by
+        # article, not counted yet
+        self.replies = Counter()
+
+
+deletions = Deletions()
+
+
+def shift_counts(comment, amount, replies=0):
+    """
+    Move the counters of the comment's article by `amount` and `replies`,
+    and the counter of the comment it replies to by `amount`
+    """
+    if comment.parent_id is not None:
+        Comment.objects.filter(pk=comment.parent_id).update(
+            replies_count=F('replies_count') + amount)
+    # the representation of the article changes along with its counter
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {Article._meta.db_table} '
+            f'SET comments_count = comments_count + %s, "reactedAt" = %s '
+            f'WHERE id = %s RETURNING slug',
+            [amount + replies, timezone.now(), comment.article_id])
+        row = cursor.fetchone()
+    if row is not None:
+        invalidate_article(row[0])
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        shift_counts(instance, 1)
+
+
+@receiver(pre_delete, sender=Article)
+def note_deleted_article(sender, instance, **kwargs):
+    deletions.articles.add(instance.pk)
+
+
+@receiver(post_delete, sender=Article)
+def forget_deleted_article(sender, instance, **kwargs):
+    deletions.articles.discard(instance.pk)
+    deletions.replies.pop(instance.pk, None)
+
+
+@receiver(pre_delete, sender=Comment)
+def note_deleted_comment(sender, instance, **kwargs):
+    deletions.comments.add(instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    deletions.comments.discard(instance.pk)
+    if instance.article_id in deletions.articles:
+        return
+    if instance.parent_id in deletions.comments:
+        deletions.replies[instance.article_id] -= 1
+        return
+    shift_counts(instance, -1,
+                 deletions.replies.pop(instance.article_id, 0))
+
+
+@receiver(request_started)
+def forget_deletions(**kwargs):
+    # a deletion that failed halfway must not affect the next requests
+    deletions.articles.clear()
+    deletions.comments.clear()
+    deletions.replies.clear()
@@ -0,0 +1,125 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory, \
+    force_authenticate
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.views import ArticleDetail
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.comments.views import CommentsCreateDeleteAPIView, \
+    CommentsListCreateAPIView
+
+
+class CommentCountTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests
+        """
+        self.request_factory = APIRequestFactory()
+        self.user = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.article = Article.objects.create(
+            title="Grit", description="Are you ready?",
+            body="It takes grit", author=self.user, slug="grit")
+
+    def comment(self, content, parent=None):
+        return Comment.objects.create(
+            content=content, user=self.user, article=self.article,
+            parent=parent)
+
+    def assertCounts(self, comments, **replies):
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, comments)
+        for comment, count in replies.items():
+            self.assertEqual(Comment.objects.get(content=comment)
+                             .replies_count, count)
+
+    def test_comments_and_replies_counted(self):
+        """
+        Test that the counters follow the comments made through the views,
+        and are shown with the article and the comments
+        """
+        url = reverse('comments:all_comments', kwargs={'slug': 'grit'})
+        request = self.request_factory.post(
+            url, {'content': 'top'}, format='json')
+        force_authenticate(request, user=self.user)
+        response = CommentsListCreateAPIView.as_view()(request, slug='grit')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pk = response.data['id']
+
+        url = reverse('comments:comment_detail',
+                      kwargs={'slug': 'grit', 'pk': pk})
+        request = self.request_factory.post(
+            url, {'content': 'reply'}, format='json')
+        force_authenticate(request, user=self.user)
+        response = CommentsCreateDeleteAPIView.as_view()(
+            request, slug='grit', pk=pk)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCounts(2, top=1, reply=0)
+
+        request = self.request_factory.get(
+            reverse('articles:article_detail', kwargs={'slug': 'grit'}))
+        response = ArticleDetail.as_view()(request, slug='grit')
+        self.assertEqual(response.data['commentsCount'], 2)
+
+        request = self.request_factory.get(
+            reverse('comments:all_comments', kwargs={'slug': 'grit'}))
+        force_authenticate(request, user=self.user)
+        response = CommentsListCreateAPIView.as_view()(request, slug='grit')
+        self.assertEqual(response.data['results'][0]['repliesCount'], 1)
+
+    def test_cascades_counted(self):
+        """
+        Test that the replies deleted along with the comment they reply to
+        are taken off the counters
+        """
+        top = self.comment('top')
+        reply = self.comment('reply', top)
+        self.comment('reply to reply', reply)
+        self.comment('other')
+        self.assertCounts(4, top=1, reply=1)
+
+        url = reverse('comments:comment_detail',
+                      kwargs={'slug': 'grit', 'pk': reply.pk})
+        request = self.request_factory.delete(url)
+        force_authenticate(request, user=self.user)
+        response = CommentsCreateDeleteAPIView.as_view()(
+            request, slug='grit', pk=reply.pk)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertCounts(2, top=0)
+
+        top.delete()
+        self.assertCounts(1)
+
+    def updates(self, queries):
+        return [query['sql'] for query in queries
+                if query['sql'].startswith('UPDATE')]
+
+    def test_cascade_counted_at_once(self):
+        """
+        Test that the replies deleted along with a comment are taken off
+        the article's counter with the comment, in one update
+        """
+        top = self.comment('top')
+        reply = self.comment('reply', top)
+        self.comment('reply to reply', reply)
+        self.comment('second reply', top)
+        with CaptureQueriesContext(connection) as queries:
+            reply.delete()
+        self.assertEqual(len(self.updates(queries)), 2)
+        self.assertCounts(2, top=1)
+
+    def test_deleted_article_not_counted(self):
+        """
+        Test that the comments deleted along with their article leave the
+        counters alone
+        """
+        top = self.comment('top')
+        self.comment('reply', top)
+        with CaptureQueriesContext(connection) as queries:
+            self.article.delete()
+        self.assertEqual(self.updates(queries), [])
+        self.assertFalse(Comment.objects.exists())
@@ -0,0 +1,115 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory, \
+    force_authenticate
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.comments.views import CommentThread
+
+
+class CommentThreadTests(APITestCase):
+    def setUp(self):
+        """
+        Data for the tests: two threads, the first three levels deep with
+        two replies to its top comment
+        """
+        self.request_factory = APIRequestFactory()
+        self.user = User.objects.create(
+            username='olivia', email='olivia@gmail.com', password='1232444nm')
+        self.article = Article.objects.create(
+            title="Grit", description="Are you ready?",
+            body="It takes grit", author=self.user, slug="grit")
+        self.top = self.comment("top")
+        self.reply = self.comment("reply", self.top)
+        self.comment("second reply", self.top)
+        self.comment("reply to reply", self.reply)
+        self.comment("other top")
+
+    def comment(self, content, parent=None):
+        return Comment.objects.create(
+            content=content, user=self.user, article=self.article,
+            parent=parent)
+
+    def get_thread(self, query='', pk=None):
+        if pk is None:
+            url = reverse('comments:comment_thread', kwargs={'slug': 'grit'})
+        else:
+            url = reverse('comments:comment_subtree',
+                          kwargs={'slug': 'grit', 'pk': pk})
+        request = self.request_factory.get(url + query)
+        force_authenticate(request, user=self.user)
+        return CommentThread.as_view()(request, slug='grit', pk=pk)
+
+    def test_forest(self):
+        """
+        Test that all the threads come nested, in a constant number of
+        queries
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_thread()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([comment['content']
+                          for comment in response.data['results']],
+                         ['top', 'other top'])
+        self.assertIsNone(response.data['next'])
+        replies = response.data['results'][0]['replies']
+        self.assertEqual([reply['content'] for reply in replies],
+                         ['reply', 'second reply'])
+        self.assertEqual(replies[0]['replies'][0]['content'],
+                         'reply to reply')
+        self.assertLessEqual(len(queries), 4)
+
+    def test_depth_and_limit(self):
+        """
+        Test that the thread stops at the depth and number of comments per
+        level asked for
+        """
+        response = self.get_thread('?max_depth=1&limit=1')
+        self.assertEqual(len(response.data['results']), 1)
+        replies = response.data['results'][0]['replies']
+        self.assertEqual([reply['content'] for reply in replies], ['reply'])
+        self.assertEqual(replies[0]['replies'], [])
+
+        response = self.get_thread('?max_depth=-1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_next_threads(self):
+        """
+        Test that the threads past the limit are reached through the next
+        link, with their replies
+        """
+        response = self.get_thread('?limit=1')
+        self.assertEqual([comment['content']
+                          for comment in response.data['results']], ['top'])
+        cursor = response.data['next'].split('cursor=')[1]
+        self.assertEqual(len(response.data['results'][0]['replies']), 1)
+
+        reply = self.comment("reply to other", Comment.objects.get(
+            content="other top"))
+        response = self.get_thread('?limit=1&cursor=' + cursor)
+        self.assertEqual([comment['content']
+                          for comment in response.data['results']],
+                         ['other top'])
+        self.assertEqual(response.data['results'][0]['replies'][0]['id'],
+                         reply.pk)
+        self.assertIsNone(response.data['next'])
+
+        response = self.get_thread('?cursor=abc')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_subtree(self):
+        """
+        Test that one comment comes with the replies under it only
+        """
+        response = self.get_thread(pk=self.reply.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'reply')
+        self.assertEqual([reply['content'] for reply in
+                          response.data['replies']], ['reply to reply'])
+
+        response = self.get_thread(pk=self.reply.pk + 100)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,10 +1,14 @@
 """Test the functionality in the comments app"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework.test import force_authenticate
 from rest_framework import status
 
+from authors.apps.articles.models import Reaction
 from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
 from authors.apps.comments.views import (
     CommentsCreateDeleteAPIView, DislikeComment, CommentsListCreateAPIView,
     LikeComment)
@@ -135,10 +139,59 @@ class CommentsTests(APITestCase):
         request = self.request_factory.get(url)
         force_authenticate(request, user=self.user)
         response = comment_view(request, slug=self.slug)
-        self.assertIsInstance(response.data, list)
+        self.assertIsInstance(response.data['results'], list)
         self.assertNotEqual(response.data, None)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def get_comments(self, url=None):
+        """List the comments, returning the response and its query count"""
+        request = self.request_factory.get(url or self.comments_url)
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.comment_view(request, slug=self.slug)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries)
+
+    def test_comment_list_query_count(self):
+        """
+        Test that listing comments takes the same number of queries however
+        many comments there are, and refers to the article by its slug
+        """
+        queries = self.get_comments()[1]
+        comment = Comment.objects.get()
+        for number in range(5):
+            reply = Comment.objects.create(
+                content=f"Reply {number}", user=self.user,
+                article=comment.article, parent=comment)
+            reply.set_reaction(self.user, Reaction.LIKE)
+
+        response, queries_after = self.get_comments()
+        self.assertEqual(queries_after, queries)
+        results = response.data['results']
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0]['article'], self.slug)
+        self.assertEqual(results[0]['user']['username'], 'olivia')
+        self.assertEqual(results[-1]['likes'], 1)
+
+    def test_comment_cursor_pagination(self):
+        """
+        Test that the comments are paged oldest first with cursors
+        """
+        comment = Comment.objects.get()
+        for number in range(4):
+            Comment.objects.create(content=f"Comment {number}",
+                                   user=self.user, article=comment.article)
+
+        response = self.get_comments(self.comments_url + '?page_size=3')[0]
+        self.assertEqual(
+            [result['content'] for result in response.data['results']],
+            [comment.content, 'Comment 0', 'Comment 1'])
+        response = self.get_comments(response.data['next'])[0]
+        self.assertEqual(
+            [result['content'] for result in response.data['results']],
+            ['Comment 2', 'Comment 3'])
+        self.assertIsNone(response.data['next'])
+
     def test_delete_non_existent(self):
         """Test that a user can't delete non-existent comment."""
         comment_view = CommentsCreateDeleteAPIView.as_view()
@@ -308,3 +361,37 @@ class LikeDislikeTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data["detail"],
                          "A comment with this ID does not exist.")
+
+    def test_reactions_counted_with_viewer_state(self):
+        """
+        Test that a like replaced by a dislike moves both counters, and
+        that the comment list shows the viewer's reactions in one query
+        """
+        comment = Comment.objects.get(pk=self.pk)
+        self.assertEqual(comment.toggle_reaction(self.user, Reaction.LIKE),
+                         Reaction.LIKE)
+        self.assertEqual(
+            comment.toggle_reaction(self.user, Reaction.DISLIKE),
+            Reaction.DISLIKE)
+        self.assertEqual((comment.likes_count, comment.dislikes_count),
+                         (0, 1))
+        # disliking again changes nothing
+        self.assertEqual(comment.set_reaction(self.user, Reaction.DISLIKE),
+                         Reaction.DISLIKE)
+        comment.refresh_from_db()
+        self.assertEqual(comment.dislikes_count, 1)
+
+        other = Comment.objects.create(
+            content="Another", user=self.user, article=comment.article)
+        request = self.request_factory.get(self.comments_url)
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.comment_view(request, slug=self.slug)
+        results = {result['id']: result
+                   for result in response.data['results']}
+        self.assertTrue(results[comment.pk]['disliked'])
+        self.assertFalse(results[comment.pk]['liked'])
+        self.assertFalse(results[other.pk]['disliked'])
+        self.assertEqual(len([query for query in queries.captured_queries
+                              if 'comments_commentreaction' in query['sql']]),
+                         1)
@@ -8,10 +8,15 @@ app_name = "comments"
 
 urlpatterns = [
     path('', views.CommentsListCreateAPIView.as_view(), name='all_comments'),
+    path('thread/', views.CommentThread.as_view(), name='comment_thread'),
     path(
         '<int:pk>/',
         views.CommentsCreateDeleteAPIView.as_view(),
         name='comment_detail'),
+    path(
+        '<int:pk>/thread/',
+        views.CommentThread.as_view(),
+        name='comment_subtree'),
     path('<int:pk>/like/', views.LikeComment.as_view(), name='like_comment'),
     path(
         '<int:pk>/dislike/',
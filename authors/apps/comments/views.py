@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.shortcuts import get_object_or_404
 
 from rest_framework import generics
@@ -6,9 +8,11 @@ from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..comments.models import Comment, CommentHistory
-from ..comments.serializers import CommentSerializer, CommentHistorySerializer
-from ..articles.models import Article
+from ..comments.models import Comment, CommentHistory, CommentReaction
+from ..comments.pagination import CommentPagination, ThreadPagination
+from ..comments.serializers import CommentSerializer, \
+    CommentHistorySerializer, CommentThreadSerializer, ThreadParamsSerializer
+from ..articles.models import Article, Reaction
 
 
 class CommentsListCreateAPIView(generics.ListCreateAPIView):
@@ -17,25 +21,33 @@ class CommentsListCreateAPIView(generics.ListCreateAPIView):
     and also creates the comments.
     """
 
-    # filter by slug from url
-    lookup_field = 'article__slug'
-    lookup_url_kwarg = 'slug'
-
-    queryset = Comment.objects.select_related()
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticated, )
+    pagination_class = CommentPagination
 
-    def filter_queryset(self, queryset):
-        """Handle getting comments on an article."""
-        filters = {self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
-        return queryset.filter(**filters)
+    def get_article(self):
+        """
+        The article commented on, looked up by its slug once per request
+        """
+        if not hasattr(self, '_article'):
+            try:
+                slug = self.kwargs['slug']
+            except Exception:
+                raise NotFound('Please check your url, slug is missing')
+            self._article = get_object_or_404(
+                Article.objects.only('id', 'slug'), slug=slug)
+        return self._article
+
+    def get_queryset(self):
+        """
+        The comments on the article, read through the related manager so
+        that they all share the article already loaded. The authors come in
+        the same query.
+        """
+        return self.get_article().comment_set.select_related('user')
 
     def get_serializer_context(self):
-        try:
-            slug = self.kwargs['slug']
-        except Exception:
-            raise NotFound('Please check your url, slug is missing')
-        get_object_or_404(Article, slug=slug)
+        slug = self.get_article().slug
         context = super(CommentsListCreateAPIView,
                         self).get_serializer_context()
         context["request"].data.update({
@@ -135,12 +147,70 @@ class CommentsCreateDeleteAPIView(generics.RetrieveUpdateDestroyAPIView,
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class CommentThread(generics.GenericAPIView):
+    """
+    Returns the threads of comments on an article, or one comment with the
+    replies under it, as nested comments loaded in a single query.
+    `?max_depth=` limits how many levels of replies are returned and
+    `?limit=` how many comments are returned per level under each comment.
+    The threads are paged by their top comments, `next` links to the
+    following ones.
+    """
+    serializer_class = CommentThreadSerializer
+    permission_classes = (IsAuthenticated, )
+    pagination_class = ThreadPagination
+
+    def get_article(self):
+        if not hasattr(self, '_article'):
+            self._article = get_object_or_404(
+                Article.objects.only('id', 'slug'), slug=self.kwargs['slug'])
+        return self._article
+
+    def get_queryset(self):
+        """
+        The comments on the article, read through the related manager so
+        that they all share the article loaded with its slug only
+        """
+        return self.get_article().comment_set.select_related('user')
+
+    def get(self, request, slug, pk=None):
+        params = ThreadParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        article = self.get_article()
+        queryset = self.get_queryset()
+        if pk is None:
+            comments = self.paginator.paginate_thread(
+                queryset, article, request, **params.validated_data)
+        else:
+            comments = list(queryset.thread(
+                article, root=pk, **params.validated_data))
+
+        replies = defaultdict(list)
+        top = []
+        for comment in comments:
+            if comment.pk == pk or (pk is None and comment.parent_id is None):
+                top.append(comment)
+            else:
+                replies[comment.parent_id].append(comment)
+        if pk is not None and not top:
+            raise NotFound('A comment with this ID does not exist.')
+
+        # the viewer's reactions to the whole thread, in one query
+        states = CommentReaction.objects.viewer_states(
+            request.user, [comment.pk for comment in comments])
+        context = dict(self.get_serializer_context(), replies=replies,
+                       viewer_states=states)
+        serializer = self.get_serializer_class()(
+            top, many=True, context=context)
+        if pk is None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data[0], status=status.HTTP_200_OK)
+
+
 class LikeComment(generics.UpdateAPIView):
     """
-    Adds the user to the list of liking users and
-    removes the user from the list of disliking users.
-    If the user likes for a second time,
-    we remove the user from the list of liking users.
+    Like the comment, replacing the user's dislike if any.
+    If the user likes for a second time, the like is removed
     """
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
@@ -148,40 +218,24 @@ class LikeComment(generics.UpdateAPIView):
 
     def update(self, request, slug, pk):
         """Updates the user's liking status on a particular comment."""
-        user = request.user
-
         try:
-            comment = Comment.objects.get(pk=pk)
+            comment = Comment.objects.only('id').get(pk=pk)
         except Comment.DoesNotExist:
             raise NotFound('A comment with this ID does not exist.')
 
-        # removes the user from the list of disliking users,
-        # nothing changes if the user does not exist in
-        # the list of disliking users
-        comment.dislikes.remove(user.id)
-
         # allows for the None option: you neither like nor dislike the comment
-        if user in comment.likes.all():
-
-            # removes the user from the list of liking users
-            comment.likes.remove(user.id)
-
+        if comment.toggle_reaction(request.user, Reaction.LIKE) is None:
             response = {"Message": "You no longer like this comment"}
             return Response(response, status=status.HTTP_200_OK)
 
-        # adds the user to the list of liking users
-        comment.likes.add(user.id)
-
         response = {"Message": "You have successfully liked this comment"}
         return Response(response, status=status.HTTP_200_OK)
 
 
 class DislikeComment(generics.UpdateAPIView):
     """
-    Adds the user to the list of disliking users and
-    removes the user from the list of liking users.
-    If the user dislikes for a second time,
-    we remove the user from the list of disliking users.
+    Dislike the comment, replacing the user's like if any.
+    If the user dislikes for a second time, the dislike is removed
     """
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
@@ -189,30 +243,16 @@ class DislikeComment(generics.UpdateAPIView):
 
     def update(self, request, slug, pk):
         """Updates the user's disliking status on a particular comment."""
-        user = request.user
-
         try:
-            comment = Comment.objects.get(pk=pk)
+            comment = Comment.objects.only('id').get(pk=pk)
         except Comment.DoesNotExist:
             raise NotFound('A comment with this ID does not exist.')
 
-        # removes the user from the list of liking users,
-        # nothing changes if the user does not exist
-        # in the list of liking users
-        comment.likes.remove(user.id)
-
         # allows for the None option: you neither like nor dislike the comment
-        if user in comment.dislikes.all():
-
-            # removes the user from the list of disliking users
-            comment.dislikes.remove(user.id)
-
+        if comment.toggle_reaction(request.user, Reaction.DISLIKE) is None:
             response = {"Message": "You no longer dislike this comment"}
             return Response(response, status=status.HTTP_200_OK)
 
-        # adds the user to the list of disliking users
-        comment.dislikes.add(user.id)
-
         response = {"Message": "You have successfully disliked this comment"}
         return Response(response, status=status.HTTP_200_OK)
 
@@ -10,3 +10,11 @@ class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('email', 'username', 'bio', 'image')
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    """Compact public representation of a user embedded in their content"""
+
+    class Meta:
+        model = User
+        fields = ('username', 'bio', 'image')
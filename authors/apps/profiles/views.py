@@ -6,6 +6,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.validators import ValidationError
+from authors.apps.articles.models import TimelineEntry
 from authors.apps.authentication.models import User
 from authors.apps.profiles.renderers import ProfileJSONRenderer, \
     FollowersJSONRenderer, FollowingJSONRenderer
@@ -47,6 +48,7 @@ class FollowUserRetrieveAPIView(RetrieveUpdateDestroyAPIView):
         # Follow the user in the follow field/join table.
         current_user.follows.add(followed_user)
         current_user.save()
+        TimelineEntry.objects.follow(current_user, followed_user)
         serializer = self.get_serializer(followed_user)
         return Response(serializer.data)
 
@@ -62,6 +64,7 @@ class FollowUserRetrieveAPIView(RetrieveUpdateDestroyAPIView):
         # unfollow the user in the follow field/join table.
         current_user.follows.remove(unfollowed_user)
         current_user.save()
+        TimelineEntry.objects.unfollow(current_user, unfollowed_user)
         serializer = self.get_serializer(unfollowed_user)
         return Response(serializer.data)
 
@@ -55,5 +55,8 @@ class RatingsSerializer(serializers.ModelSerializer):
             # if not found then create the rating in the Ratings table
             article.ratings.create(user=current_user, stars=stars)
 
+        # the article's average rating has changed
+        article.mark_reacted()
+
         # return that rating to be displayed to the user
         return article.ratings.get(user=current_user, stars=stars)
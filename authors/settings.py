@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'django_extensions',
     'django_filters',
@@ -185,6 +186,43 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 CORS_ORIGIN_ALLOW_ALL = True
 
+# Default minimum trigram similarity (0 to 1) for the fuzzy article title and
+# author filters, can be overridden per request with `?similarity=`
+TRIGRAM_SIMILARITY_THRESHOLD = 0.3
+
+# The cached article responses and their versions must be shared by all the
+# processes serving the API, or the invalidations made by one of them would
+# never reach the others. Deployments running more than one process, such as
+# several gunicorn workers, must set `SCORPION_MEMCACHED_LOCATION` to their
+# memcached servers, separated by commas. Without it each process keeps its
+# own cache in memory, so the cached article responses and the validators of
+# the article lists are turned off by `ARTICLE_CACHE_ENABLED`.
+if os.environ.get('SCORPION_MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION':
+                os.environ['SCORPION_MEMCACHED_LOCATION'].split(','),
+        }
+    }
+    ARTICLE_CACHE_ENABLED = True
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    ARTICLE_CACHE_ENABLED = False
+
+# Article detail responses are invalidated in the cache whenever the article
+# changes, this lifetime in seconds is only a safety net
+ARTICLE_CACHE_TTL = int(os.environ.get('SCORPION_ARTICLE_CACHE_TTL', 300))
+
+# New articles are copied into the feed of every follower of their author,
+# except for authors with more followers than this whose articles are read
+# into the feeds when they are requested instead
+FEED_FANOUT_LIMIT = int(os.environ.get('SCORPION_FEED_FANOUT_LIMIT', 10000))
+
 # Tell Django about the custom `User` model we created. The string
 # `authentication.User` tells Django we are referring to the `User` model in
 # the `authentication` module. This module is registered above in a setting